@@ -1,7 +1,15 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
 from app import models, schemas
+from app.pagination import PageParams, keyset, to_page
+from app.services.barter_index import get_barter_index
+from app.services.cycle_signatures import get_live_signatures, participants_signature
+from app.services.leaderboard import LeaderboardEntry, get_leaderboard
+from app.services.stats_cache import get_stats_cache
 import json
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 # ==================== USER CRUD ====================
@@ -18,8 +26,12 @@ def get_user(db: Session, user_id: int):
 def get_user_by_email(db: Session, email: str):
     return db.query(models.User).filter(models.User.email == email).first()
 
-def get_all_users(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.User).offset(skip).limit(limit).all()
+def get_all_users(db: Session, page: PageParams = PageParams(), email: Optional[str] = None):
+    query = db.query(models.User)
+    if email:
+        # Case-insensitive, like the login form always was
+        query = query.filter(func.lower(models.User.email) == email.lower())
+    return to_page(keyset(query, models.User, page).all(), page)
 
 # ==================== ITEM CRUD ====================
 def create_item(db: Session, item: schemas.ItemCreate, owner_id: int):
@@ -27,13 +39,15 @@ def create_item(db: Session, item: schemas.ItemCreate, owner_id: int):
     db.add(db_item)
     db.commit()
     db.refresh(db_item)
+    get_stats_cache().invalidate(owner_id)
     return db_item
 
 def get_item(db: Session, item_id: int):
     return db.query(models.Item).filter(models.Item.id == item_id).first()
 
-def get_user_items(db: Session, user_id: int):
-    return db.query(models.Item).filter(models.Item.owner_id == user_id).all()
+def get_user_items(db: Session, user_id: int, page: PageParams = PageParams()):
+    query = db.query(models.Item).filter(models.Item.owner_id == user_id)
+    return to_page(keyset(query, models.Item, page).all(), page)
 
 def update_item_status(db: Session, item_id: int, status: str):
     db_item = get_item(db, item_id)
@@ -41,6 +55,12 @@ def update_item_status(db: Session, item_id: int, status: str):
         db_item.status = status
         db.commit()
         db.refresh(db_item)
+        get_stats_cache().invalidate(db_item.owner_id)
+        if status == "available":
+            # Its active edges are matchable again; reload them on next use
+            get_barter_index().invalidate()
+        else:
+            get_barter_index().remove_item(item_id)
     return db_item
 
 # ==================== BARTER EDGE CRUD ====================
@@ -49,16 +69,22 @@ def create_barter_edge(db: Session, barter: schemas.BarterIntentCreate, user_id:
     db.add(db_barter)
     db.commit()
     db.refresh(db_barter)
+    get_barter_index().add_edge(db_barter)
     return db_barter
 
 def get_active_barter_edges(db: Session):
-    return db.query(models.BarterEdge).filter(models.BarterEdge.active == True).all()
+    """Active edges with their item and owner eager-loaded in a single query"""
+    return db.query(models.BarterEdge).options(
+        joinedload(models.BarterEdge.item),
+        joinedload(models.BarterEdge.user)
+    ).filter(models.BarterEdge.active == True).all()
 
-def get_user_barter_edges(db: Session, user_id: int):
-    return db.query(models.BarterEdge).filter(
+def get_user_barter_edges(db: Session, user_id: int, page: PageParams = PageParams()):
+    query = db.query(models.BarterEdge).filter(
         models.BarterEdge.user_id == user_id,
         models.BarterEdge.active == True
-    ).all()
+    )
+    return to_page(keyset(query, models.BarterEdge, page).all(), page)
 
 def deactivate_barter_edge(db: Session, edge_id: int):
     db_edge = db.query(models.BarterEdge).filter(models.BarterEdge.id == edge_id).first()
@@ -66,66 +92,190 @@ def deactivate_barter_edge(db: Session, edge_id: int):
         db_edge.active = False
         db.commit()
         db.refresh(db_edge)
+        get_barter_index().remove_edge(edge_id)
     return db_edge
 
 # ==================== MATCH CRUD ====================
+def _match_members(participants: List[dict]) -> List[models.MatchParticipant]:
+    """One match_participants row per hand-off, in cycle order"""
+    return [
+        models.MatchParticipant(
+            position=position,
+            user_id=participant["user_id"],
+            item_id=participant["item_id"],
+            wants=participant.get("wants"),
+            accepted=False
+        )
+        for position, participant in enumerate(participants)
+    ]
+
 def create_match(db: Session, user_id: int, match_type: str, participants: List[dict]):
-    """Create a new match with participants as JSON"""
-    db_match = models.Match(
-        user_id=user_id,
-        type=match_type,
-        participants=json.dumps(participants),
-        status="pending",
-        accepted_by=json.dumps([])
-    )
-    db.add(db_match)
-    db.commit()
-    db.refresh(db_match)
+    """Create a new match and its participant rows (returns the live match if the cycle already has one)"""
+    signature = participants_signature(participants)
+    live = get_live_signatures(db)
+    with live.lock:
+        if signature in live:
+            existing = get_live_match_by_signature(db, signature)
+            if existing:
+                return existing
+        db_match = models.Match(
+            user_id=user_id,
+            type=match_type,
+            participants=json.dumps(participants),
+            cycle_signature=signature,
+            status="pending",
+            members=_match_members(participants)
+        )
+        db.add(db_match)
+        db.commit()
+        db.refresh(db_match)
+        live.add(signature)
+    get_stats_cache().invalidate(user_id, *{participant["user_id"] for participant in participants})
     return db_match
 
+def create_matches_bulk(db: Session, matches: List[dict]):
+    """Create many matches in a single transaction and return their ids (known live cycles are skipped)"""
+    live = get_live_signatures(db)
+    with live.lock:
+        db_matches, signatures = [], set()
+        for match in matches:
+            signature = participants_signature(match["participants"])
+            if signature in live or signature in signatures:
+                continue
+            signatures.add(signature)
+            db_matches.append(models.Match(
+                user_id=match["user_id"],
+                type=match["match_type"],
+                participants=json.dumps(match["participants"]),
+                cycle_signature=signature,
+                status="pending",
+                members=_match_members(match["participants"])
+            ))
+        db.add_all(db_matches)
+        db.flush()
+        match_ids = [match.id for match in db_matches]
+        db.commit()
+        for signature in signatures:
+            live.add(signature)
+    get_stats_cache().invalidate(*{match["user_id"] for match in matches}, *{
+        participant["user_id"] for match in matches for participant in match["participants"]
+    })
+    return match_ids
+
+def get_live_match_by_signature(db: Session, signature: str):
+    return db.query(models.Match).filter(
+        models.Match.cycle_signature == signature,
+        models.Match.status == "pending"
+    ).first()
+
+def get_live_cycle_signatures(db: Session) -> set:
+    """Signatures of every pending match"""
+    rows = db.query(models.Match.cycle_signature).filter(models.Match.status == "pending").all()
+    return {signature for (signature,) in rows if signature}
+
+def get_pending_match_item_ids(db: Session) -> set:
+    """Item ids already committed to a pending match"""
+    rows = db.query(models.MatchParticipant.item_id).join(models.Match).filter(
+        models.Match.status == "pending"
+    ).all()
+    return {item_id for (item_id,) in rows}
+
+def _with_members(query):
+    """Load participant rows with their users and items alongside the matches"""
+    return query.options(
+        selectinload(models.Match.members).joinedload(models.MatchParticipant.user),
+        selectinload(models.Match.members).joinedload(models.MatchParticipant.item)
+    )
+
 def get_match(db: Session, match_id: int):
     return db.query(models.Match).filter(models.Match.id == match_id).first()
 
-def get_user_matches(db: Session, user_id: int):
-    return db.query(models.Match).filter(models.Match.user_id == user_id).all()
+def get_user_matches(db: Session, user_id: int, page: PageParams = PageParams()):
+    """Every match the user takes part in, not only the ones they initiated"""
+    involved = db.query(models.MatchParticipant.match_id).filter(models.MatchParticipant.user_id == user_id)
+    query = _with_members(db.query(models.Match)).filter(models.Match.id.in_(involved))
+    return to_page(keyset(query, models.Match, page).all(), page)
+
+def get_pending_matches_for_item(db: Session, item_id: int, page: PageParams = PageParams()):
+    """Pending matches that would hand off the given item"""
+    involved = db.query(models.MatchParticipant.match_id).filter(models.MatchParticipant.item_id == item_id)
+    query = _with_members(db.query(models.Match)).filter(
+        models.Match.id.in_(involved),
+        models.Match.status == "pending"
+    )
+    return to_page(keyset(query, models.Match, page).all(), page)
 
 def accept_match(db: Session, match_id: int, user_id: int):
-    """Accept a match and award eco credits if all participants accepted"""
+    """
+    Accept a match; the acceptance that completes it awards eco credits and
+    marks every item swapped in the same transaction, with one commit
+    """
     db_match = get_match(db, match_id)
     if not db_match:
         return None
     
-    # Parse accepted_by list
-    accepted_by = json.loads(db_match.accepted_by) if db_match.accepted_by else []
-    
-    # Add user if not already accepted
-    if user_id not in accepted_by:
-        accepted_by.append(user_id)
-        db_match.accepted_by = json.dumps(accepted_by)
-    
-    # Check if all participants have accepted
-    participants = json.loads(db_match.participants)
-    all_user_ids = [p['user_id'] for p in participants]
+    # Only this user's participant rows change, so concurrent acceptances don't collide
+    db.execute(
+        update(models.MatchParticipant)
+        .where(
+            models.MatchParticipant.match_id == match_id,
+            models.MatchParticipant.user_id == user_id,
+            models.MatchParticipant.accepted == False
+        )
+        .values(accepted=True, accepted_at=datetime.utcnow())
+    )
+    waiting = db.query(func.count(models.MatchParticipant.id)).filter(
+        models.MatchParticipant.match_id == match_id,
+        models.MatchParticipant.accepted == False
+    ).scalar()
     
-    if set(accepted_by) == set(all_user_ids):
-        db_match.status = "completed"
-        
-        # Award eco credits to all participants
-        for participant in participants:
-            award_eco_credit(
-                db=db,
-                user_id=participant['user_id'],
-                amount=10,
-                reason=f"Completed {db_match.type} swap",
-                match_id=match_id
+    members = db_match.members
+    totals, item_ids = {}, []
+    if not waiting:
+        # Conditional update so concurrent final acceptances complete (and award) only once
+        completed = db.execute(
+            update(models.Match)
+            .where(models.Match.id == match_id, models.Match.status != "completed")
+            .values(status="completed")
+        ).rowcount
+        if completed:
+            amounts = {}
+            for member in members:
+                amounts[member.user_id] = amounts.get(member.user_id, 0) + 10
+            db.execute(insert(models.EcoCredit), [
+                {
+                    "user_id": member.user_id,
+                    "amount": 10,
+                    "reason": f"Completed {db_match.type} swap",
+                    "match_id": match_id
+                }
+                for member in members
+            ])
+            totals = _increment_eco_credit_totals(db, amounts)
+            item_ids = [member.item_id for member in members]
+            db.execute(
+                update(models.Item)
+                .where(models.Item.id.in_(item_ids))
+                .values(status="swapped")
             )
-        
-        # Update item statuses
-        for participant in participants:
-            update_item_status(db, participant['item_id'], "swapped")
+            # The swapped items' intents are fulfilled, so the cycle can't be proposed again
+            db.execute(
+                update(models.BarterEdge)
+                .where(models.BarterEdge.item_id.in_(item_ids), models.BarterEdge.active == True)
+                .values(active=False)
+                .execution_options(synchronize_session=False)
+            )
+    user_ids = [member.user_id for member in members]
     
     db.commit()
     db.refresh(db_match)
+    if totals:
+        get_live_signatures().discard(db_match.cycle_signature)
+        index = get_barter_index()
+        for item_id in item_ids:
+            index.remove_item(item_id)
+        _publish_eco_credit_totals(db, totals)
+    get_stats_cache().invalidate(*user_ids)
     return db_match
 
 # ==================== LOST & FOUND CRUD ====================
@@ -136,21 +286,69 @@ def create_lost_found(db: Session, lost_found: schemas.LostFoundCreate, user_id:
     db.refresh(db_lost_found)
     return db_lost_found
 
-def get_lost_found_items(db: Session, type_filter: Optional[str] = None):
+def get_lost_found_items(db: Session, type_filter: Optional[str] = None, page: PageParams = PageParams()):
     query = db.query(models.LostFound).filter(models.LostFound.active == True)
     if type_filter:
         query = query.filter(models.LostFound.type == type_filter)
-    return query.all()
+    return to_page(keyset(query, models.LostFound, page).all(), page)
 
-def get_lost_found_by_category(db: Session, category: str):
-    return db.query(models.LostFound).filter(
+def get_lost_found_by_category(db: Session, category: str, page: PageParams = PageParams()):
+    query = db.query(models.LostFound).filter(
         models.LostFound.category == category,
         models.LostFound.active == True
-    ).all()
+    )
+    return to_page(keyset(query, models.LostFound, page).all(), page)
 
 # ==================== ECO CREDIT CRUD ====================
+def _increment_eco_credit_totals(db: Session, amounts: Dict[int, int]) -> Dict[int, int]:
+    """
+    Atomically add amounts to users' running balances inside the caller's
+    transaction and return the new totals. One upsert (ON CONFLICT DO UPDATE,
+    or ON DUPLICATE KEY UPDATE on MySQL), so two first credits for the same
+    user can't both insert.
+    """
+    name = db.get_bind().dialect.name
+    now = datetime.utcnow()
+    # Sorted, so concurrent multi-user awards lock rows in the same order
+    rows = [{"user_id": user_id, "total": amounts[user_id], "updated_at": now} for user_id in sorted(amounts)]
+    if name == "mysql":
+        statement = mysql.insert(models.EcoCreditTotal).values(rows)
+        db.execute(statement.on_duplicate_key_update(
+            total=models.EcoCreditTotal.total + statement.inserted.total,
+            updated_at=statement.inserted.updated_at
+        ))
+        # No RETURNING on MySQL; the upsert holds the row locks, so a locking read sees the new totals
+        return dict(db.execute(
+            select(models.EcoCreditTotal.user_id, models.EcoCreditTotal.total)
+            .where(models.EcoCreditTotal.user_id.in_(amounts))
+            .with_for_update()
+        ).all())
+    if name not in ("sqlite", "postgresql"):
+        raise NotImplementedError(f"Eco-credit totals upsert is not implemented for {name}")
+    # SQLite and PostgreSQL share the ON CONFLICT syntax
+    dialect = postgresql if name == "postgresql" else sqlite
+    statement = dialect.insert(models.EcoCreditTotal).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=[models.EcoCreditTotal.user_id],
+        set_={
+            "total": models.EcoCreditTotal.total + statement.excluded.total,
+            "updated_at": statement.excluded.updated_at
+        }
+    ).returning(models.EcoCreditTotal.user_id, models.EcoCreditTotal.total)
+    return dict(db.execute(statement).all())
+
+def _publish_eco_credit_totals(db: Session, totals: Dict[int, int]):
+    """Push committed totals to the leaderboard and drop the users' cached stats"""
+    leaderboard = get_leaderboard()
+    users = db.query(models.User.id, models.User.name, models.User.department).filter(
+        models.User.id.in_(totals)
+    ).all()
+    for user_id, name, department in users:
+        leaderboard.update(user_id, name, department, totals[user_id])
+    get_stats_cache().invalidate(*totals)
+
 def award_eco_credit(db: Session, user_id: int, amount: int, reason: str, match_id: Optional[int] = None):
-    """Award eco credits to a user"""
+    """Award eco credits to a user and update their total and leaderboard position"""
     db_credit = models.EcoCredit(
         user_id=user_id,
         amount=amount,
@@ -158,40 +356,215 @@ def award_eco_credit(db: Session, user_id: int, amount: int, reason: str, match_
         match_id=match_id
     )
     db.add(db_credit)
+    # Ledger row and running balance change in the same transaction
+    totals = _increment_eco_credit_totals(db, {user_id: amount})
     db.commit()
     db.refresh(db_credit)
+    _publish_eco_credit_totals(db, totals)
     return db_credit
 
+def get_user_eco_credits(db: Session, user_id: int, page: PageParams = PageParams()):
+    query = db.query(models.EcoCredit).filter(models.EcoCredit.user_id == user_id)
+    return to_page(keyset(query, models.EcoCredit, page).all(), page)
+
 def get_user_total_eco_credits(db: Session, user_id: int) -> int:
-    """Get total eco credits for a user"""
-    credits = db.query(models.EcoCredit).filter(models.EcoCredit.user_id == user_id).all()
-    return sum(credit.amount for credit in credits)
+    """Get total eco credits for a user (the maintained running balance)"""
+    total = db.query(models.EcoCreditTotal.total).filter(models.EcoCreditTotal.user_id == user_id).scalar()
+    return total or 0
+
+def get_latest_eco_credit_snapshot(db: Session, user_id: int):
+    return db.query(models.EcoCreditSnapshot).filter(
+        models.EcoCreditSnapshot.user_id == user_id
+    ).order_by(models.EcoCreditSnapshot.id.desc()).first()
+
+def get_eco_credit_history(db: Session, user_id: int) -> Dict:
+    """Balance at the latest snapshot plus the ledger rows recorded since"""
+    snapshot = get_latest_eco_credit_snapshot(db, user_id)
+    since_id = snapshot.last_credit_id if snapshot else 0
+    credits = db.query(models.EcoCredit).filter(
+        models.EcoCredit.user_id == user_id,
+        models.EcoCredit.id > since_id
+    ).order_by(models.EcoCredit.id).all()
+    return {
+        "user_id": user_id,
+        "opening_balance": snapshot.balance if snapshot else 0,
+        "snapshot_at": snapshot.created_at if snapshot else None,
+        "credits": credits,
+        "balance": get_user_total_eco_credits(db, user_id)
+    }
+
+def _latest_snapshots(db: Session):
+    """Subquery: each user's most recent snapshot"""
+    latest_ids = db.query(func.max(models.EcoCreditSnapshot.id)).group_by(models.EcoCreditSnapshot.user_id)
+    return db.query(
+        models.EcoCreditSnapshot.user_id,
+        models.EcoCreditSnapshot.balance,
+        models.EcoCreditSnapshot.last_credit_id
+    ).filter(models.EcoCreditSnapshot.id.in_(latest_ids)).subquery()
+
+def _ledger_since_snapshots(db: Session):
+    """Per user: latest snapshot balance, plus sum and last id of ledger rows after it"""
+    latest = _latest_snapshots(db)
+    return db.query(
+        models.EcoCredit.user_id,
+        func.coalesce(latest.c.balance, 0).label("opening_balance"),
+        func.coalesce(func.sum(models.EcoCredit.amount), 0).label("amount"),
+        func.max(models.EcoCredit.id).label("last_credit_id")
+    ).outerjoin(latest, latest.c.user_id == models.EcoCredit.user_id).filter(
+        models.EcoCredit.id > func.coalesce(latest.c.last_credit_id, 0)
+    ).group_by(models.EcoCredit.user_id, latest.c.balance)
+
+def create_eco_credit_snapshots(db: Session) -> int:
+    """Snapshot the balance of every user with ledger rows since their last snapshot"""
+    snapshots = [
+        models.EcoCreditSnapshot(
+            user_id=row.user_id,
+            balance=row.opening_balance + row.amount,
+            last_credit_id=row.last_credit_id
+        )
+        for row in _ledger_since_snapshots(db).all()
+    ]
+    db.add_all(snapshots)
+    db.commit()
+    return len(snapshots)
+
+def reconcile_eco_credits(db: Session, full: bool = False, fix: bool = False) -> Dict:
+    """
+    Verify running balances against the ledger. By default only rows since each
+    user's latest snapshot are read; full re-sums the whole ledger instead.
+    With fix, mismatched balances are reset to the ledger value.
+    """
+    if full:
+        ledger = dict(db.query(models.EcoCredit.user_id, func.sum(models.EcoCredit.amount))
+                      .group_by(models.EcoCredit.user_id).all())
+    else:
+        latest = _latest_snapshots(db)
+        ledger = {user_id: balance for user_id, balance in db.query(latest.c.user_id, latest.c.balance).all()}
+        for row in _ledger_since_snapshots(db).all():
+            ledger[row.user_id] = row.opening_balance + row.amount
+    balances = dict(db.query(models.EcoCreditTotal.user_id, models.EcoCreditTotal.total).all())
+
+    mismatches = [
+        {"user_id": user_id, "balance": balances.get(user_id), "ledger": ledger.get(user_id, 0)}
+        for user_id in sorted(set(ledger) | set(balances))
+        if user_id not in balances or balances[user_id] != ledger.get(user_id, 0)
+    ]
+    if fix and mismatches:
+        for mismatch in mismatches:
+            db.merge(models.EcoCreditTotal(user_id=mismatch["user_id"], total=mismatch["ledger"]))
+        db.commit()
+        get_leaderboard().invalidate()
+        get_stats_cache().invalidate(*[mismatch["user_id"] for mismatch in mismatches])
+    return {
+        "mode": "full" if full else "since_snapshot",
+        "users_checked": len(set(ledger) | set(balances)),
+        "mismatches": mismatches,
+        "fixed": len(mismatches) if fix else 0
+    }
+
+def get_leaderboard_entries(db: Session) -> List[LeaderboardEntry]:
+    """Every user with a credit total, joined with their name and department in one query"""
+    rows = db.query(
+        models.EcoCreditTotal.user_id, models.User.name, models.User.department, models.EcoCreditTotal.total
+    ).join(models.User, models.User.id == models.EcoCreditTotal.user_id).all()
+    return [LeaderboardEntry(*row) for row in rows]
 
 def get_user_stats(db: Session, user_id: int):
-    """Get comprehensive user statistics"""
-    user = get_user(db, user_id)
-    if not user:
+    """Get comprehensive user statistics (cached until the user's items, matches or credits change)"""
+    cache = get_stats_cache()
+    stats = cache.get(user_id)
+    if stats is not None:
+        return stats
+    generation = cache.generation
+
+    def match_count(status: str):
+        # Every match the user takes part in, not only the ones they initiated
+        return select(func.count(func.distinct(models.MatchParticipant.match_id))).join(models.Match).where(
+            models.MatchParticipant.user_id == models.User.id,
+            models.Match.status == status
+        ).scalar_subquery()
+
+    # One round trip: every figure is a correlated subquery on the user row
+    row = db.query(
+        models.User.name,
+        func.coalesce(
+            select(models.EcoCreditTotal.total)
+            .where(models.EcoCreditTotal.user_id == models.User.id)
+            .scalar_subquery(),
+            0
+        ),
+        match_count("completed"),
+        select(func.count(models.Item.id)).where(
+            models.Item.owner_id == models.User.id,
+            models.Item.status == "available"
+        ).scalar_subquery(),
+        match_count("pending")
+    ).filter(models.User.id == user_id).first()
+    if row is None:
         return None
-    
-    total_credits = get_user_total_eco_credits(db, user_id)
-    total_swaps = db.query(models.Match).filter(
-        models.Match.user_id == user_id,
-        models.Match.status == "completed"
-    ).count()
-    active_items = db.query(models.Item).filter(
-        models.Item.owner_id == user_id,
-        models.Item.status == "available"
-    ).count()
-    pending_matches = db.query(models.Match).filter(
-        models.Match.user_id == user_id,
-        models.Match.status == "pending"
-    ).count()
-    
-    return {
+
+    user_name, total_credits, total_swaps, active_items, pending_matches = row
+    stats = {
         "user_id": user_id,
-        "user_name": user.name,
+        "user_name": user_name,
         "total_eco_credits": total_credits,
         "total_swaps": total_swaps,
         "active_items": active_items,
         "pending_matches": pending_matches
     }
+    cache.put(user_id, stats, generation)
+    return stats
+
+# ==================== BULK IMPORT CRUD ====================
+# Each call inserts one chunk with a single executemany INSERT and commits it
+def get_user_ids_by_email(db: Session, emails: List[str]) -> Dict[str, int]:
+    rows = db.query(models.User.email, models.User.id).filter(models.User.email.in_(emails)).all()
+    return dict(rows)
+
+def get_items_for_owners(db: Session, owner_ids: List[int]) -> List:
+    """(id, owner_id, name) of every item the given users own, oldest first"""
+    return db.query(models.Item.id, models.Item.owner_id, models.Item.name).filter(
+        models.Item.owner_id.in_(owner_ids)
+    ).order_by(models.Item.id).all()
+
+def create_users_bulk(db: Session, rows: List[dict]) -> int:
+    if rows:
+        db.execute(insert(models.User), rows)
+        db.commit()
+    return len(rows)
+
+def create_items_bulk(db: Session, rows: List[dict]) -> int:
+    if rows:
+        db.execute(insert(models.Item), rows)
+        db.commit()
+        get_stats_cache().invalidate(*{row["owner_id"] for row in rows})
+    return len(rows)
+
+def create_barter_edges_bulk(db: Session, rows: List[dict]) -> int:
+    """Insert edges without indexing them one by one; the barter index reloads on next use"""
+    if rows:
+        db.execute(insert(models.BarterEdge), rows)
+        db.commit()
+        get_barter_index().invalidate()
+    return len(rows)
+
+# ==================== ASYNC CRUD ====================
+# AsyncSession counterparts of the functions above, for async def routes
+async def get_user_async(db: AsyncSession, user_id: int):
+    return await db.get(models.User, user_id)
+
+async def create_item_async(db: AsyncSession, item: schemas.ItemCreate, owner_id: int):
+    db_item = models.Item(**item.model_dump(), owner_id=owner_id)
+    db.add(db_item)
+    await db.commit()
+    await db.refresh(db_item)
+    get_stats_cache().invalidate(owner_id)
+    return db_item
+
+async def get_item_async(db: AsyncSession, item_id: int):
+    return await db.get(models.Item, item_id)
+
+async def get_user_items_async(db: AsyncSession, user_id: int, page: PageParams = PageParams()):
+    query = select(models.Item).where(models.Item.owner_id == user_id)
+    result = await db.execute(keyset(query, models.Item, page))
+    return to_page(result.scalars().all(), page)
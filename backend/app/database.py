@@ -1,4 +1,6 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
@@ -13,13 +15,110 @@ if os.path.exists("/tmp"):
 
 DATABASE_URL = os.getenv("DATABASE_URL", DB_PATH)
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
-)
+# Engine profile: "auto" picks sqlite_wal or postgres_pool from DATABASE_URL;
+# "basic" is the untuned engine (rollback journal, default pool) for comparison
+DB_PROFILE = os.getenv("DB_PROFILE", "auto")
+
+# Applied to every new SQLite connection by the sqlite_wal profile
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",  # readers no longer block behind the writer
+    "synchronous": "NORMAL",  # fsync at checkpoints, not every commit; safe with WAL
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536")) * -1,  # negative = KiB
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE_MB", "256")) * 1024 * 1024,
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "temp_store": "MEMORY",
+}
+
+# Pool settings for the postgres_pool profile
+POSTGRES_POOL = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+    "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30")),
+    "pool_recycle": int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800")),
+    "pool_pre_ping": True,
+}
+
+def _apply_sqlite_pragmas(engine: Engine, in_memory: bool):
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in SQLITE_PRAGMAS.items():
+            # WAL needs a file; in-memory databases keep their journal
+            if name == "journal_mode" and in_memory:
+                continue
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+def resolve_profile(url: str, profile: str = "auto") -> str:
+    if profile != "auto":
+        return profile
+    if url.startswith("sqlite"):
+        return "sqlite_wal"
+    if url.startswith("postgres"):
+        return "postgres_pool"
+    return "basic"
+
+def _engine_options(url: str, profile: str) -> dict:
+    if profile == "sqlite_wal":
+        return {"connect_args": {"check_same_thread": False}}
+    if profile == "postgres_pool":
+        return dict(POSTGRES_POOL)
+    if profile == "basic":
+        return {"connect_args": {"check_same_thread": False} if "sqlite" in url else {}}
+    raise ValueError(f"Unknown database profile: {profile}")
+
+def _is_in_memory(url: str) -> bool:
+    return url.split("?")[0].endswith(("sqlite://", ":memory:")) or "mode=memory" in url
+
+def make_engine(url: str = DATABASE_URL, profile: str = DB_PROFILE) -> Engine:
+    """Create an engine for url with the given profile (basic, sqlite_wal, postgres_pool or auto)"""
+    profile = resolve_profile(url, profile)
+    # SQLAlchemy 1.4+ no longer accepts the postgres:// scheme some hosts hand out
+    if url.startswith("postgres://"):
+        url = "postgresql://" + url[len("postgres://"):]
+    engine = create_engine(url, **_engine_options(url, profile))
+    if profile == "sqlite_wal":
+        _apply_sqlite_pragmas(engine, _is_in_memory(url))
+    return engine
+
+def async_url(url: str) -> str:
+    """The same database through an async driver (aiosqlite / asyncpg / aiomysql)"""
+    if url.startswith("postgres://"):
+        url = "postgresql://" + url[len("postgres://"):]
+    scheme, rest = url.split("://", 1)
+    driverless = scheme.split("+")[0]
+    driver = {"sqlite": "aiosqlite", "postgresql": "asyncpg", "mysql": "aiomysql"}.get(driverless)
+    if driver is None:
+        raise ValueError(f"No async driver configured for {driverless}")
+    return f"{driverless}+{driver}://{rest}"
+
+def make_async_engine(url: str = DATABASE_URL, profile: str = DB_PROFILE) -> AsyncEngine:
+    """Async counterpart of make_engine, with the same profile settings"""
+    profile = resolve_profile(url, profile)
+    url = async_url(url)
+    options = _engine_options(url, profile)
+    if url.startswith("sqlite"):
+        # aiosqlite runs each connection on its own thread
+        options.pop("connect_args", None)
+    engine = create_async_engine(url, **options)
+    if profile == "sqlite_wal":
+        _apply_sqlite_pragmas(engine.sync_engine, _is_in_memory(url))
+    return engine
+
+engine = make_engine()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async path for async def routes, so database waits yield to the event loop.
+# Built on first use, so only deployments serving those routes need the async driver
+_async_sessionmaker = None
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        _async_sessionmaker = async_sessionmaker(make_async_engine(), autoflush=False, expire_on_commit=False)
+    return _async_sessionmaker
+
 Base = declarative_base()
 
 def get_db():
@@ -29,3 +128,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    """Dependency for getting an async database session"""
+    async with get_async_sessionmaker()() as db:
+        yield db
@@ -1,12 +1,17 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from app.routers import users, items, barter, matches, lost_found, eco_credits
+from app.routers import users, items, barter, matches, lost_found, eco_credits, admin, imports
 from app.database import engine, Base
+from app.migrations import run_migrations
+from app.services.credit_snapshots import snapshot_loop
+from app.services.market_clearing import clearing_loop
+import asyncio
 import os
 
 # Create Tables on Startup (Essential for Vercel/Mock DB)
 Base.metadata.create_all(bind=engine)
+run_migrations(engine)
 
 app = FastAPI(
     title="🌍 Eco-Sync API",
@@ -34,6 +39,25 @@ app.include_router(barter.router, prefix="/api/v1")
 app.include_router(matches.router, prefix="/api/v1")
 app.include_router(lost_found.router, prefix="/api/v1")
 app.include_router(eco_credits.router, prefix="/api/v1")
+app.include_router(admin.router, prefix="/api/v1")
+app.include_router(imports.router, prefix="/api/v1")
+
+# Optional scheduled market clearing (disabled unless an interval is set)
+MARKET_CLEARING_INTERVAL = int(os.getenv("MARKET_CLEARING_INTERVAL_SECONDS", "0"))
+# Periodic eco-credit ledger snapshots (hourly by default, 0 disables)
+ECO_CREDIT_SNAPSHOT_INTERVAL = int(os.getenv("ECO_CREDIT_SNAPSHOT_INTERVAL_SECONDS", "3600"))
+
+@app.on_event("startup")
+async def start_market_clearing():
+    """Start the background market-clearing schedule"""
+    if MARKET_CLEARING_INTERVAL > 0:
+        asyncio.create_task(clearing_loop(MARKET_CLEARING_INTERVAL))
+
+@app.on_event("startup")
+async def start_eco_credit_snapshots():
+    """Start the background eco-credit snapshot schedule"""
+    if ECO_CREDIT_SNAPSHOT_INTERVAL > 0:
+        asyncio.create_task(snapshot_loop(ECO_CREDIT_SNAPSHOT_INTERVAL))
 
 @app.get("/")
 def root():
@@ -0,0 +1,147 @@
+"""
+Lightweight schema migrations.
+
+Base.metadata.create_all only creates missing tables, so columns and indexes
+added to existing tables are applied here. Each migration runs once and is
+recorded in the schema_migrations table; migrations must also be safe on a
+fresh database where create_all already built the latest schema.
+"""
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import SAWarning
+from app import models
+from app.services.cycle_signatures import participants_signature
+import json
+import warnings
+
+def _columns(conn: Connection, table: str) -> set:
+    return {column["name"] for column in inspect(conn).get_columns(table)}
+
+def _indexes(conn: Connection, table: str) -> set:
+    """Names of the table's column indexes (expression indexes are not reflected)"""
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", "Skipped unsupported reflection", SAWarning)
+        return {index["name"] for index in inspect(conn).get_indexes(table)}
+
+def add_match_cycle_signature(conn: Connection):
+    """Add matches.cycle_signature, index it and backfill it from participants"""
+    if "cycle_signature" not in _columns(conn, "matches"):
+        conn.execute(text("ALTER TABLE matches ADD COLUMN cycle_signature VARCHAR(255)"))
+    if "ix_matches_cycle_signature" not in _indexes(conn, "matches"):
+        conn.execute(text("CREATE INDEX ix_matches_cycle_signature ON matches (cycle_signature)"))
+
+    rows = conn.execute(text("SELECT id, participants FROM matches WHERE cycle_signature IS NULL")).all()
+    updates = []
+    for match_id, participants in rows:
+        participants = json.loads(participants or "[]")
+        if participants:
+            updates.append({"id": match_id, "signature": participants_signature(participants)})
+    if updates:
+        conn.execute(text("UPDATE matches SET cycle_signature = :signature WHERE id = :id"), updates)
+
+def backfill_eco_credit_totals(conn: Connection):
+    """Create eco_credit_totals and fill it from the credit ledger"""
+    models.EcoCreditTotal.__table__.create(conn, checkfirst=True)
+    conn.execute(text(
+        "INSERT INTO eco_credit_totals (user_id, total, updated_at) "
+        "SELECT user_id, SUM(amount), CURRENT_TIMESTAMP FROM eco_credits "
+        "WHERE user_id NOT IN (SELECT user_id FROM eco_credit_totals) GROUP BY user_id"
+    ))
+
+def backfill_match_participants(conn: Connection):
+    """Create match_participants and fill it from the participants/accepted_by JSON of each match"""
+    models.MatchParticipant.__table__.create(conn, checkfirst=True)
+    rows = conn.execute(text(
+        "SELECT id, participants, accepted_by FROM matches "
+        "WHERE id NOT IN (SELECT match_id FROM match_participants)"
+    )).all()
+    members = []
+    for match_id, participants, accepted_by in rows:
+        accepted = set(json.loads(accepted_by or "[]"))
+        for position, participant in enumerate(json.loads(participants or "[]")):
+            members.append({
+                "match_id": match_id,
+                "position": position,
+                "user_id": participant["user_id"],
+                "item_id": participant["item_id"],
+                "wants": participant.get("wants"),
+                "accepted": participant["user_id"] in accepted
+            })
+    if members:
+        conn.execute(models.MatchParticipant.__table__.insert(), members)
+
+# Composite indexes for the hot crud filters (declared in models.__table_args__)
+HOT_PATH_INDEXES = {
+    "items": ["ix_items_owner_status"],
+    "barter_edges": ["ix_barter_edges_active"],
+    "matches": ["ix_matches_user_status", "ix_matches_status"],
+}
+
+# (created_at, id) indexes behind keyset pagination of the list endpoints
+KEYSET_INDEXES = {
+    "users": ["ix_users_created"],
+    "items": ["ix_items_owner_created"],
+    "barter_edges": ["ix_barter_edges_user_active_created"],
+    "matches": ["ix_matches_created"],
+    "lost_found": ["ix_lost_found_active_created", "ix_lost_found_active_type_created",
+                   "ix_lost_found_category_active_created"],
+    "eco_credits": ["ix_eco_credits_user_created"],
+}
+
+def _create_declared_indexes(conn: Connection, index_names_by_table: dict):
+    """Create indexes declared in models that the database does not have yet"""
+    for table_name, index_names in index_names_by_table.items():
+        existing = _indexes(conn, table_name)
+        for index in models.Base.metadata.tables[table_name].indexes:
+            if index.name in index_names and index.name not in existing:
+                index.create(conn)
+
+def add_hot_path_indexes(conn: Connection):
+    """Create the hot-path indexes that databases built before they were declared lack"""
+    _create_declared_indexes(conn, HOT_PATH_INDEXES)
+
+def add_keyset_indexes(conn: Connection):
+    """Create the keyset pagination indexes"""
+    _create_declared_indexes(conn, KEYSET_INDEXES)
+
+def add_email_lookup_index(conn: Connection):
+    """Create the expression index behind case-insensitive email lookups"""
+    # Expression indexes are not reflected, so let the database skip an existing one
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_users_email_lower ON users (lower(email))"))
+
+# Hot-path indexes that became prefixes of a keyset index: the longer index
+# serves the same lookups, so keeping both only slows inserts
+REDUNDANT_INDEXES = ["ix_barter_edges_user_active", "ix_lost_found_active_type", "ix_eco_credits_user"]
+
+def drop_redundant_indexes(conn: Connection):
+    """Drop indexes covered by a longer index with the same leading columns"""
+    for index_name in REDUNDANT_INDEXES:
+        conn.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+
+# Applied in order; never rename or reorder an entry once released
+MIGRATIONS = [
+    ("0001_match_cycle_signature", add_match_cycle_signature),
+    ("0002_eco_credit_totals", backfill_eco_credit_totals),
+    ("0003_match_participants", backfill_match_participants),
+    ("0004_hot_path_indexes", add_hot_path_indexes),
+    ("0005_keyset_indexes", add_keyset_indexes),
+    ("0006_email_lookup_index", add_email_lookup_index),
+    ("0007_drop_redundant_indexes", drop_redundant_indexes),
+]
+
+def run_migrations(engine: Engine):
+    """Apply pending migrations, each in its own transaction"""
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "name VARCHAR(100) PRIMARY KEY, applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+        ))
+        applied = {name for (name,) in conn.execute(text("SELECT name FROM schema_migrations"))}
+
+    for name, migrate in MIGRATIONS:
+        if name in applied:
+            continue
+        with engine.begin() as conn:
+            migrate(conn)
+            conn.execute(text("INSERT INTO schema_migrations (name) VALUES (:name)"), {"name": name})
+        print(f"✅ Applied migration {name}")
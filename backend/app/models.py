@@ -1,10 +1,13 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text, Float
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text, Float, Index, func
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_created", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
@@ -21,9 +24,16 @@ class User(Base):
     lost_found_items = relationship("LostFound", back_populates="user")
     eco_credits = relationship("EcoCredit", back_populates="user")
 
+# Case-insensitive email lookups (login)
+Index("ix_users_email_lower", func.lower(User.email))
+
 
 class Item(Base):
     __tablename__ = "items"
+    __table_args__ = (
+        Index("ix_items_owner_status", "owner_id", "status"),
+        Index("ix_items_owner_created", "owner_id", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -42,6 +52,10 @@ class Item(Base):
 
 class BarterEdge(Base):
     __tablename__ = "barter_edges"
+    __table_args__ = (
+        Index("ix_barter_edges_active", "active"),
+        Index("ix_barter_edges_user_active_created", "user_id", "active", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -59,21 +73,55 @@ class BarterEdge(Base):
 
 class Match(Base):
     __tablename__ = "matches"
+    __table_args__ = (
+        Index("ix_matches_user_status", "user_id", "status"),
+        Index("ix_matches_status", "status"),
+        Index("ix_matches_created", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    type = Column(String(50), nullable=False)  # direct, three_way
-    participants = Column(Text, nullable=False)  # JSON string
+    type = Column(String(50), nullable=False)  # direct, three_way, multi_way
+    participants = Column(Text, nullable=False)  # JSON snapshot as created; queries use match_participants
+    cycle_signature = Column(String(255), index=True)  # rotation-invariant item id cycle
     status = Column(String(50), default="pending")  # pending, accepted, completed, rejected
     created_at = Column(DateTime, default=datetime.utcnow)
-    accepted_by = Column(Text)  # JSON array of user IDs who accepted
+    accepted_by = Column(Text)  # Legacy JSON array; acceptance now lives in match_participants
     
     # Relationships
     user = relationship("User", back_populates="matches")
+    members = relationship(
+        "MatchParticipant", back_populates="match",
+        order_by="MatchParticipant.position", cascade="all, delete-orphan"
+    )
+
+
+class MatchParticipant(Base):
+    __tablename__ = "match_participants"
+    
+    # One row per hand-off of a match, in cycle order, with its own acceptance
+    id = Column(Integer, primary_key=True, index=True)
+    match_id = Column(Integer, ForeignKey("matches.id"), nullable=False, index=True)
+    position = Column(Integer, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    item_id = Column(Integer, ForeignKey("items.id"), nullable=False, index=True)
+    wants = Column(String(100))
+    accepted = Column(Boolean, default=False, nullable=False)
+    accepted_at = Column(DateTime)
+    
+    # Relationships
+    match = relationship("Match", back_populates="members")
+    user = relationship("User")
+    item = relationship("Item")
 
 
 class LostFound(Base):
     __tablename__ = "lost_found"
+    __table_args__ = (
+        Index("ix_lost_found_active_created", "active", "created_at", "id"),
+        Index("ix_lost_found_active_type_created", "active", "type", "created_at", "id"),
+        Index("ix_lost_found_category_active_created", "category", "active", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -91,6 +139,9 @@ class LostFound(Base):
 
 class EcoCredit(Base):
     __tablename__ = "eco_credits"
+    __table_args__ = (
+        Index("ix_eco_credits_user_created", "user_id", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -101,3 +152,23 @@ class EcoCredit(Base):
     
     # Relationships
     user = relationship("User", back_populates="eco_credits")
+
+
+class EcoCreditTotal(Base):
+    __tablename__ = "eco_credit_totals"
+    
+    # Per-user credit total, maintained by award_eco_credit
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    total = Column(Integer, nullable=False, default=0, index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class EcoCreditSnapshot(Base):
+    __tablename__ = "eco_credit_snapshots"
+    
+    # Balance of a user's ledger up to and including last_credit_id
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    balance = Column(Integer, nullable=False)
+    last_credit_id = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
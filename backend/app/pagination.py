@@ -0,0 +1,62 @@
+"""
+Keyset pagination for list endpoints.
+
+Pages are ordered newest first by (created_at, id). The cursor is an opaque
+token for the last row of the previous page; the next page continues
+strictly after it, so page cost does not grow with depth the way OFFSET does
+and rows inserted meanwhile never shift a page.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from fastapi import HTTPException, Query
+from sqlalchemy import tuple_
+from typing import Any, Dict, List, Optional, Tuple
+import base64
+import json
+import os
+
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "50"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "200"))
+
+@dataclass(frozen=True)
+class PageParams:
+    limit: int = DEFAULT_PAGE_SIZE
+    after: Optional[Tuple[datetime, int]] = None
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of encode_cursor; raises ValueError for anything it did not produce"""
+    try:
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+def page_params(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
+) -> PageParams:
+    """Dependency for the limit/cursor query parameters of a list endpoint"""
+    try:
+        return PageParams(limit=limit, after=decode_cursor(cursor) if cursor else None)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def keyset(query, model, page: PageParams):
+    """Restrict a Query or Select to one page of model rows, newest first (fetches one extra row)"""
+    if page.after is not None:
+        created_at, row_id = page.after
+        # Row-value comparison, so the index seeks straight to the cursor
+        query = query.filter(tuple_(model.created_at, model.id) < tuple_(created_at, row_id))
+    return query.order_by(model.created_at.desc(), model.id.desc()).limit(page.limit + 1)
+
+def to_page(rows: List[Any], page: PageParams) -> Dict:
+    """Page body for rows fetched with keyset()"""
+    items = rows[:page.limit]
+    next_cursor = None
+    if len(rows) > page.limit:
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+    return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,61 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app import crud
+from app.database import get_db
+from app.services.barter_index import get_barter_index
+from app.services.cycle_detection import run_cycle_sweep
+from app.services.cycle_signatures import get_live_signatures
+from app.services.market_clearing import run_market_clearing, CLEARING_MAX_CYCLE_LENGTH, CLEARING_CYCLES_PER_EDGE
+from app.services.matching_queue import get_matching_queue
+from app.services.similarity import get_similarity_table
+from app.services.stats_cache import get_stats_cache
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+@router.post("/market-clearing")
+def trigger_market_clearing(
+    max_cycle_length: int = Query(CLEARING_MAX_CYCLE_LENGTH, ge=2, le=6),
+    cycles_per_edge: int = Query(CLEARING_CYCLES_PER_EDGE, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Run a global market-clearing pass and report what was matched and how long it took"""
+    return run_market_clearing(db, max_cycle_length=max_cycle_length, cycles_per_edge=cycles_per_edge)
+
+@router.get("/cycle-sweep")
+def trigger_cycle_sweep(
+    extract: bool = Query(True),
+    cycles_per_edge: int = Query(1, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Find every user on a 2- or 3-way cycle in one pass and count stranded users"""
+    return run_cycle_sweep(db, extract=extract, cycles_per_edge=cycles_per_edge)
+
+@router.get("/matching-stats")
+def get_matching_stats(db: Session = Depends(get_db)):
+    """Barter index size, similarity cache hit rate and matching queue depth"""
+    index = get_barter_index(db)
+    return {
+        "active_edges": len(index.edges),
+        "item_categories": len(index.by_item_category),
+        "want_categories": len(index.by_want_category),
+        "live_cycle_signatures": len(get_live_signatures(db)),
+        "similarity_cache": get_similarity_table().stats(),
+        "matching_queue": get_matching_queue().stats(),
+        "user_stats_cache": get_stats_cache().stats()
+    }
+
+@router.post("/eco-credits/reconcile")
+def reconcile_eco_credits(
+    full: bool = Query(False),
+    fix: bool = Query(False),
+    snapshot: bool = Query(False),
+    db: Session = Depends(get_db)
+):
+    """
+    Check balances against the ledger inside the server process, so a fix also
+    refreshes this server's leaderboard and cached stats
+    """
+    report = crud.reconcile_eco_credits(db, full=full, fix=fix)
+    clean = not report["mismatches"] or report["fixed"]
+    report["snapshots"] = crud.create_eco_credit_snapshots(db) if snapshot and clean else 0
+    return report
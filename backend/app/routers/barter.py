@@ -2,9 +2,11 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from app import crud, schemas
 from app.database import get_db
-from app.services.matching_engine import run_matching
-from typing import List
-import json
+from app.pagination import PageParams, page_params
+from app.services.barter_index import get_barter_index
+from app.services.matching_engine import item_matches_want
+from app.services.matching_queue import get_matching_queue
+from app.services.similarity import MATCH_THRESHOLD
 
 router = APIRouter(prefix="/barter", tags=["barter"])
 
@@ -14,7 +16,7 @@ def create_barter_intent(
     intent: schemas.BarterIntentCreate = None,
     db: Session = Depends(get_db)
 ):
-    """Create a barter intent and trigger matching"""
+    """Create a barter intent and queue a matching job for it (run in-request when MATCHING_MODE=inline)"""
     user = crud.get_user(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -29,37 +31,51 @@ def create_barter_intent(
     # Create barter edge
     barter_edge = crud.create_barter_edge(db, intent, user_id)
     
-    # Run matching algorithm
-    match_result = run_matching(db, user_id)
+    # Queue matching (only cycles through the new edge) and return immediately;
+    # emergency intents are scheduled ahead of regular ones
+    job = get_matching_queue().submit(user_id, barter_edge.id, emergency=barter_edge.emergency)
     
-    if match_result:
-        # Create match in database
-        match = crud.create_match(
-            db=db,
-            user_id=user_id,
-            match_type=match_result["type"],
-            participants=match_result["participants"]
-        )
-        
-        return {
-            "barter_intent": schemas.BarterIntentOut.model_validate(barter_edge),
-            "match_found": True,
-            "match": {
-                "id": match.id,
-                "type": match_result["type"],
-                "participants": match_result["participants"],
-                "explanation": match_result.get("explanation"),
-                "flow": match_result.get("flow")
-            }
-        }
-    else:
-        return {
-            "barter_intent": schemas.BarterIntentOut.model_validate(barter_edge),
-            "match_found": False,
-            "message": "No matches found yet. We'll notify you when a match is available!"
+    return {
+        "barter_intent": schemas.BarterIntentOut.model_validate(barter_edge),
+        "job_id": job.job_id,
+        "status": job.status,
+        "job": job.to_dict(),
+        "message": "Intent posted! We'll notify you when a match is available!"
+    }
+
+@router.get("/matching-jobs/{job_id}")
+def get_matching_job(job_id: str):
+    """Get the status of a matching job and its match once found"""
+    job = get_matching_queue().get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Matching job not found")
+    return job.to_dict()
+
+@router.get("/similar-categories")
+def get_similar_categories(
+    q: str = Query(..., min_length=1),
+    description: str = Query(None),
+    k: int = Query(5, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """Item categories on offer that are most like what the user wants (nearest-neighbour query)"""
+    index = get_barter_index(db)
+    text = f"{q} {description}" if description else q
+    return [
+        {
+            "category": category,
+            "similarity": round(score, 4),
+            "available": len(index.edge_ids_having(category)),
+            "matches": item_matches_want(category, q) >= MATCH_THRESHOLD
         }
+        for category, score in index.similar_item_categories(text, k=k)
+    ]
 
-@router.get("/barter-intents/{user_id}", response_model=List[schemas.BarterIntentOut])
-def get_user_barter_intents(user_id: int, db: Session = Depends(get_db)):
-    """Get all barter intents for a user"""
-    return crud.get_user_barter_edges(db, user_id)
+@router.get("/barter-intents/{user_id}", response_model=schemas.Page[schemas.BarterIntentOut])
+def get_user_barter_intents(
+    user_id: int,
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db)
+):
+    """Get a user's active barter intents, newest first"""
+    return crud.get_user_barter_edges(db, user_id, page)
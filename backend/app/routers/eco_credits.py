@@ -1,43 +1,51 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from app import crud, schemas, models
+from app import crud, schemas
 from app.database import get_db
-from typing import List
+from app.pagination import MAX_PAGE_SIZE, PageParams, page_params
+from app.services.leaderboard import get_leaderboard
+from typing import Optional
 
 router = APIRouter(prefix="/eco-credits", tags=["eco-credits"])
 
-@router.get("/{user_id}", response_model=List[schemas.EcoCreditOut])
-def get_user_eco_credits(user_id: int, db: Session = Depends(get_db)):
-    """Get all eco credit transactions for a user"""
+@router.get("/{user_id}", response_model=schemas.Page[schemas.EcoCreditOut])
+def get_user_eco_credits(user_id: int, page: PageParams = Depends(page_params), db: Session = Depends(get_db)):
+    """Get a user's eco credit transactions, newest first"""
     user = crud.get_user(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    credits = db.query(models.EcoCredit).filter(models.EcoCredit.user_id == user_id).all()
-    return credits
+    return crud.get_user_eco_credits(db, user_id, page)
 
-@router.get("/leaderboard/top")
-def get_leaderboard(limit: int = 10, db: Session = Depends(get_db)):
-    """Get top users by eco credits"""
-    users = crud.get_all_users(db)
-    
-    leaderboard = []
-    for user in users:
-        total_credits = crud.get_user_total_eco_credits(db, user.id)
-        if total_credits > 0:
-            leaderboard.append({
-                "rank": 0,  # Will be set after sorting
-                "user_id": user.id,
-                "user_name": user.name,
-                "department": user.department,
-                "total_eco_credits": total_credits
-            })
-    
-    # Sort by credits descending
-    leaderboard.sort(key=lambda x: x["total_eco_credits"], reverse=True)
+@router.get("/{user_id}/history", response_model=schemas.EcoCreditHistoryOut)
+def get_user_eco_credit_history(user_id: int, db: Session = Depends(get_db)):
+    """Get the balance at the last ledger snapshot and the transactions since"""
+    user = crud.get_user(db, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
     
-    # Assign ranks
-    for idx, entry in enumerate(leaderboard[:limit]):
-        entry["rank"] = idx + 1
+    return crud.get_eco_credit_history(db, user_id)
+
+@router.get("/leaderboard/top")
+def get_top_leaderboard(limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE), department: Optional[str] = None, db: Session = Depends(get_db)):
+    """Get top users by eco credits, campus-wide or within one department"""
+    return get_leaderboard(db).top(limit, department)
+
+@router.get("/leaderboard/rank/{user_id}")
+def get_leaderboard_rank(
+    user_id: int,
+    scope: str = Query("campus", pattern="^(campus|department)$"),
+    db: Session = Depends(get_db)
+):
+    """Get a user's leaderboard rank, campus-wide or within their own department"""
+    user = crud.get_user(db, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
     
-    return leaderboard[:limit]
+    department = user.department if scope == "department" else None
+    rank = get_leaderboard(db).rank_of(user_id, department)
+    if rank is None:
+        # Users without credits are not ranked
+        return {"rank": None, "user_id": user_id, "user_name": user.name,
+                "department": user.department, "total_eco_credits": 0}
+    return rank
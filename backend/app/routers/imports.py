@@ -0,0 +1,61 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Query, UploadFile
+from sqlalchemy.orm import Session
+from app import schemas
+from app.database import get_db
+from app.services.bulk_import import IMPORT_CHUNK_SIZE, detect_format, import_records
+from app.services.market_clearing import run_scheduled_clearing
+from typing import Optional
+import io
+
+router = APIRouter(prefix="/import", tags=["import"])
+
+def _import_upload(db: Session, kind: str, file: UploadFile, format: Optional[str], chunk_size: int):
+    try:
+        fmt = format or detect_format(file.filename)
+        # newline="" so quoted CSV fields may span lines; utf-8-sig drops a spreadsheet BOM
+        stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+        return import_records(db, kind, stream, fmt, chunk_size=chunk_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/users", response_model=schemas.ImportReportOut)
+def import_users(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(jsonl|csv)$", description="defaults to the file extension"),
+    chunk_size: int = Query(IMPORT_CHUNK_SIZE, ge=1, le=50000),
+    db: Session = Depends(get_db)
+):
+    """Register users from a JSON Lines or CSV file (UserCreate fields per row)"""
+    return _import_upload(db, "users", file, format, chunk_size)
+
+@router.post("/items", response_model=schemas.ImportReportOut)
+def import_items(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(jsonl|csv)$", description="defaults to the file extension"),
+    chunk_size: int = Query(IMPORT_CHUNK_SIZE, ge=1, le=50000),
+    db: Session = Depends(get_db)
+):
+    """List items from a JSON Lines or CSV file (ItemCreate fields plus owner_email per row)"""
+    return _import_upload(db, "items", file, format, chunk_size)
+
+@router.post("/barter-intents", response_model=schemas.ImportReportOut)
+def import_barter_intents(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(jsonl|csv)$", description="defaults to the file extension"),
+    chunk_size: int = Query(IMPORT_CHUNK_SIZE, ge=1, le=50000),
+    match: bool = Query(True, description="run one market-clearing sweep after the import"),
+    db: Session = Depends(get_db)
+):
+    """
+    Create barter intents from a JSON Lines or CSV file (owner_email, item_id or
+    item_name, want_category, ...). Instead of a matching job per intent, a
+    single market-clearing sweep runs once the response is sent.
+    """
+    report = _import_upload(db, "barter_intents", file, format, chunk_size)
+    if match and report["imported"]:
+        background_tasks.add_task(run_scheduled_clearing)
+        report["matching"] = "scheduled"
+    else:
+        report["matching"] = "skipped"
+    return report
@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app import crud, schemas
-from app.database import get_db
+from app.database import get_async_db
+from app.pagination import PageParams, page_params
 from app.services.gemini_agent import get_gemini_analyzer
-from typing import List
+import aiofiles
 import os
-import shutil
 from datetime import datetime
 
 router = APIRouter(prefix="/items", tags=["items"])
@@ -14,22 +14,22 @@ UPLOAD_DIR = "uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 @router.post("/users/{user_id}/items", response_model=schemas.ItemOut)
-def create_item(user_id: int, item: schemas.ItemCreate, db: Session = Depends(get_db)):
+async def create_item(user_id: int, item: schemas.ItemCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new item for a user"""
-    user = crud.get_user(db, user_id)
+    user = await crud.get_user_async(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    return crud.create_item(db, item, user_id)
+    return await crud.create_item_async(db, item, user_id)
 
 @router.post("/users/{user_id}/items/upload-photo")
 async def upload_item_photo(
     user_id: int,
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Upload item photo and get Gemini AI analysis"""
-    user = crud.get_user(db, user_id)
+    user = await crud.get_user_async(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -42,8 +42,9 @@ async def upload_item_photo(
     filename = f"{user_id}_{timestamp}_{file.filename}"
     file_path = os.path.join(UPLOAD_DIR, filename)
     
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    async with aiofiles.open(file_path, "wb") as buffer:
+        while chunk := await file.read(1024 * 1024):
+            await buffer.write(chunk)
     
     # Analyze with Gemini
     analyzer = get_gemini_analyzer()
@@ -58,7 +59,7 @@ async def upload_item_photo(
         photo_url=f"/uploads/{filename}"
     )
     
-    item = crud.create_item(db, item_data, user_id)
+    item = await crud.create_item_async(db, item_data, user_id)
     
     return {
         "item": item,
@@ -66,15 +67,19 @@ async def upload_item_photo(
         "photo_url": f"/uploads/{filename}"
     }
 
-@router.get("/users/{user_id}/items", response_model=List[schemas.ItemOut])
-def get_user_items(user_id: int, db: Session = Depends(get_db)):
-    """Get all items for a user"""
-    return crud.get_user_items(db, user_id)
+@router.get("/users/{user_id}/items", response_model=schemas.Page[schemas.ItemOut])
+async def get_user_items(
+    user_id: int,
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get a user's items, newest first"""
+    return await crud.get_user_items_async(db, user_id, page)
 
 @router.get("/{item_id}", response_model=schemas.ItemOut)
-def get_item(item_id: int, db: Session = Depends(get_db)):
+async def get_item(item_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get item by ID"""
-    item = crud.get_item(db, item_id)
+    item = await crud.get_item_async(db, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
     return item
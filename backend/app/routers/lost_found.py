@@ -2,7 +2,8 @@ from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
 from sqlalchemy.orm import Session
 from app import crud, schemas
 from app.database import get_db
-from typing import List, Optional
+from app.pagination import PageParams, page_params
+from typing import Optional
 import os
 import shutil
 from datetime import datetime
@@ -47,17 +48,18 @@ async def upload_lost_found_photo(
         
     return {"photo_url": f"/uploads/{filename}"}
 
-@router.get("/")
+@router.get("/", response_model=schemas.Page[schemas.LostFoundOut])
 def get_lost_found_items(
     type: Optional[str] = Query(None),
     category: Optional[str] = Query(None),
+    page: PageParams = Depends(page_params),
     db: Session = Depends(get_db)
 ):
-    """Get lost & found items with optional filters"""
+    """Get active lost & found items, newest first, with optional filters"""
     if category:
-        return crud.get_lost_found_by_category(db, category)
+        return crud.get_lost_found_by_category(db, category, page)
     else:
-        return crud.get_lost_found_items(db, type_filter=type)
+        return crud.get_lost_found_items(db, type_filter=type, page=page)
 
 @router.get("/{item_id}", response_model=schemas.LostFoundOut)
 def get_lost_found_item(item_id: int, db: Session = Depends(get_db)):
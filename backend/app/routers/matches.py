@@ -1,34 +1,67 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from app import crud, schemas
+from app import crud
 from app.database import get_db
-from typing import List
-import json
+from app.pagination import PageParams, page_params
+from app.services.matching_engine import find_ranked_matches, TOP_K, MAX_EXPANSIONS, TIME_BUDGET_MS
 
 router = APIRouter(prefix="/matches", tags=["matches"])
 
+def _format_match(match) -> dict:
+    return {
+        "id": match.id,
+        "type": match.type,
+        "participants": [
+            {
+                "user_id": member.user_id,
+                "user_name": member.user.name,
+                "item_id": member.item_id,
+                "item_name": member.item.name,
+                "wants": member.wants
+            }
+            for member in match.members
+        ],
+        "status": match.status,
+        "created_at": match.created_at,
+        "accepted_by": [member.user_id for member in match.members if member.accepted]
+    }
+
+def _format_page(page: dict) -> dict:
+    return {"items": [_format_match(match) for match in page["items"]], "next_cursor": page["next_cursor"]}
+
+@router.get("/items/{item_id}/pending")
+def get_item_pending_matches(item_id: int, page: PageParams = Depends(page_params), db: Session = Depends(get_db)):
+    """Get pending matches that would hand off an item, newest first"""
+    if not crud.get_item(db, item_id):
+        raise HTTPException(status_code=404, detail="Item not found")
+    
+    return _format_page(crud.get_pending_matches_for_item(db, item_id, page))
+
 @router.get("/{user_id}")
-def get_user_matches(user_id: int, db: Session = Depends(get_db)):
-    """Get all matches for a user"""
+def get_user_matches(user_id: int, page: PageParams = Depends(page_params), db: Session = Depends(get_db)):
+    """Get the matches a user takes part in, newest first"""
     user = crud.get_user(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    matches = crud.get_user_matches(db, user_id)
-    
-    # Format matches with parsed JSON
-    formatted_matches = []
-    for match in matches:
-        formatted_matches.append({
-            "id": match.id,
-            "type": match.type,
-            "participants": json.loads(match.participants),
-            "status": match.status,
-            "created_at": match.created_at,
-            "accepted_by": json.loads(match.accepted_by) if match.accepted_by else []
-        })
+    return _format_page(crud.get_user_matches(db, user_id, page))
+
+@router.get("/{user_id}/suggestions")
+def get_match_suggestions(
+    user_id: int,
+    k: int = Query(TOP_K, ge=1, le=50),
+    max_expansions: int = Query(MAX_EXPANSIONS, ge=1, le=1000000),
+    time_budget_ms: float = Query(TIME_BUDGET_MS, gt=0, le=2000),
+    db: Session = Depends(get_db)
+):
+    """Get the top-k ranked 2-way and 3-way swap suggestions for a user"""
+    user = crud.get_user(db, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
     
-    return formatted_matches
+    return find_ranked_matches(
+        db, user_id, k=k, max_expansions=max_expansions, time_budget_ms=time_budget_ms
+    )
 
 @router.post("/{match_id}/accept")
 def accept_match(match_id: int, user_id: int = Query(...), db: Session = Depends(get_db)):
@@ -42,10 +75,7 @@ def accept_match(match_id: int, user_id: int = Query(...), db: Session = Depends
         raise HTTPException(status_code=404, detail="Match not found")
     
     # Verify user is part of this match
-    participants = json.loads(match.participants)
-    participant_ids = [p["user_id"] for p in participants]
-    
-    if user_id not in participant_ids:
+    if user_id not in {member.user_id for member in match.members}:
         raise HTTPException(status_code=403, detail="User is not part of this match")
     
     # Accept the match
@@ -54,6 +84,6 @@ def accept_match(match_id: int, user_id: int = Query(...), db: Session = Depends
     return {
         "match_id": match_id,
         "status": updated_match.status,
-        "accepted_by": json.loads(updated_match.accepted_by),
+        "accepted_by": [member.user_id for member in updated_match.members if member.accepted],
         "message": "Match completed! Eco-credits awarded." if updated_match.status == "completed" else "Match accepted. Waiting for other participants."
     }
@@ -2,7 +2,8 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app import crud, schemas
 from app.database import get_db
-from typing import List
+from app.pagination import PageParams, page_params
+from typing import Optional
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -16,10 +17,14 @@ def create_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
     
     return crud.create_user(db, user)
 
-@router.get("/", response_model=List[schemas.UserOut])
-def get_all_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Get all users"""
-    return crud.get_all_users(db, skip=skip, limit=limit)
+@router.get("/", response_model=schemas.Page[schemas.UserOut])
+def get_all_users(
+    email: Optional[str] = None,
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db)
+):
+    """Get users, newest first, optionally only the one with a given email"""
+    return crud.get_all_users(db, page, email=email)
 
 @router.get("/{user_id}", response_model=schemas.UserOut)
 def get_user(user_id: int, db: Session = Depends(get_db)):
@@ -1,7 +1,14 @@
-from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, List
+from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator
+from typing import Generic, Optional, List, TypeVar
 from datetime import datetime
 
+T = TypeVar("T")
+
+# One page of a list endpoint; pass next_cursor back as ?cursor= for the next
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
 # User Schemas
 class UserCreate(BaseModel):
     name: str
@@ -118,6 +125,13 @@ class EcoCreditOut(BaseModel):
     class Config:
         from_attributes = True
 
+class EcoCreditHistoryOut(BaseModel):
+    user_id: int
+    opening_balance: int
+    snapshot_at: Optional[datetime] = None
+    credits: List[EcoCreditOut]
+    balance: int
+
 class UserStatsOut(BaseModel):
     user_id: int
     user_name: str
@@ -129,6 +143,48 @@ class UserStatsOut(BaseModel):
     class Config:
         from_attributes = True
 
+# Bulk Import Schemas (one row of an import file; rows point at users by email)
+def normalize_owner_email(value: str) -> str:
+    # owner_email is only a lookup key, so skip full EmailStr validation (the slow
+    # part of an import) and just match how registered emails are stored
+    local, _, domain = value.strip().rpartition("@")
+    return f"{local}@{domain.lower()}" if local else value.strip()
+
+class ItemImport(ItemCreate):
+    owner_email: str
+
+    _normalize_owner_email = field_validator("owner_email")(normalize_owner_email)
+
+class BarterIntentImport(BaseModel):
+    owner_email: str
+    item_id: Optional[int] = None
+    item_name: Optional[str] = None  # the owner's newest item with this name
+    want_category: str
+    want_description: Optional[str] = None
+    emergency: bool = False
+
+    _normalize_owner_email = field_validator("owner_email")(normalize_owner_email)
+
+    @model_validator(mode="after")
+    def check_item_reference(self):
+        if self.item_id is None and not self.item_name:
+            raise ValueError("item_id or item_name is required")
+        return self
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+class ImportReportOut(BaseModel):
+    kind: str
+    received: int
+    imported: int
+    failed: int
+    errors: List[ImportRowError]
+    duration_s: float
+    rows_per_s: float
+    matching: Optional[str] = None
+
 # Gemini Analysis Response
 class GeminiAnalysisResponse(BaseModel):
     item_name: str
@@ -0,0 +1,285 @@
+from sqlalchemy.orm import Session
+from app import models
+from app.services.semantic_index import VectorIndex, get_semantic_encoder
+from app.services.similarity import get_similarity_table, MATCH_THRESHOLD
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import threading
+
+def normalize_category(category: Optional[str]) -> str:
+    """Normalize a category string for index keys and similarity lookups"""
+    return (category or "").lower()
+
+@dataclass
+class UserSnapshot:
+    """Fields of a barter participant needed for matching and scoring"""
+    id: int
+    name: str
+    department: str
+    semester: int
+    hostel: str
+
+@dataclass
+class IndexedEdge:
+    """Lightweight, session-independent view of an active barter edge"""
+    edge_id: int
+    user_id: int
+    item_id: int
+    item_name: str
+    item_category: str
+    want_category: str
+    emergency: bool
+    user: UserSnapshot
+
+class BarterIndex:
+    """
+    In-memory inverted index of active barter edges whose item is still
+    available; an item that is swapped or in a swap drops out with all of its
+    edges, so searches never need to check item status.
+    Edges are bucketed by normalized item category ("who has X") and by
+    normalized want category ("who wants X") so candidate lookups are hash
+    lookups instead of full scans over every active edge.
+
+    It also keeps the barter graph at category level: which item categories
+    satisfy each want category. The graph is updated incrementally as
+    categories appear and disappear, so it never needs a full rebuild.
+
+    Item and want buckets are also kept per hostel, so hostel-local searches
+    (the emergency fast path) only touch edges in the requester's hostel.
+
+    Item and want categories are also held in vector indexes, so "categories
+    like X" is a nearest-neighbour query; with the semantic matcher new
+    categories are linked into the graph through them. Only the category
+    keys are embedded: want_description is free text for people and never
+    affects which items satisfy a want.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.loaded = False
+        self.edges: Dict[int, IndexedEdge] = {}
+        self.by_item_category: Dict[str, Set[int]] = {}
+        self.by_want_category: Dict[str, Set[int]] = {}
+        self.by_user: Dict[int, Set[int]] = {}
+        self.by_item: Dict[int, Set[int]] = {}
+        # (hostel, normalized category) -> edge ids
+        self.by_hostel_item_category: Dict[Tuple[str, str], Set[int]] = {}
+        self.by_hostel_want_category: Dict[Tuple[str, str], Set[int]] = {}
+        # want category -> item categories that satisfy it, and the reverse
+        self.satisfies: Dict[str, Set[str]] = {}
+        self.satisfied_by: Dict[str, Set[str]] = {}
+        self.item_vectors = VectorIndex(get_semantic_encoder())
+        self.want_vectors = VectorIndex(get_semantic_encoder())
+
+    def rebuild(self, edges: Iterable[models.BarterEdge]):
+        """Rebuild the whole index from active BarterEdge rows (item and user eager-loaded)"""
+        with self._lock:
+            self.edges.clear()
+            self.by_item_category.clear()
+            self.by_want_category.clear()
+            self.by_user.clear()
+            self.by_item.clear()
+            self.by_hostel_item_category.clear()
+            self.by_hostel_want_category.clear()
+            self.satisfies.clear()
+            self.satisfied_by.clear()
+            self.item_vectors = VectorIndex(get_semantic_encoder())
+            self.want_vectors = VectorIndex(get_semantic_encoder())
+            for edge in edges:
+                self._add(edge)
+            self.loaded = True
+
+    def invalidate(self):
+        """Drop the index so the next lookup rebuilds it from the database"""
+        with self._lock:
+            self.loaded = False
+
+    def add_edge(self, edge: models.BarterEdge):
+        """Index a newly created edge (no-op until the index is first loaded)"""
+        with self._lock:
+            if self.loaded and edge.active:
+                self._add(edge)
+
+    def remove_edge(self, edge_id: int):
+        """Drop a deactivated edge from every bucket"""
+        with self._lock:
+            entry = self.edges.pop(edge_id, None)
+            if not entry:
+                return
+            item_key = normalize_category(entry.item_category)
+            want_key = normalize_category(entry.want_category)
+            self._discard(self.by_item_category, item_key, edge_id)
+            self._discard(self.by_want_category, want_key, edge_id)
+            self._discard(self.by_user, entry.user_id, edge_id)
+            self._discard(self.by_item, entry.item_id, edge_id)
+            self._discard(self.by_hostel_item_category, (entry.user.hostel, item_key), edge_id)
+            self._discard(self.by_hostel_want_category, (entry.user.hostel, want_key), edge_id)
+            if item_key not in self.by_item_category:
+                self.item_vectors.remove(item_key)
+                for want in self.satisfied_by.pop(item_key, ()):
+                    self.satisfies[want].discard(item_key)
+            if want_key not in self.by_want_category:
+                self.want_vectors.remove(want_key)
+                for item in self.satisfies.pop(want_key, ()):
+                    self.satisfied_by[item].discard(want_key)
+
+    def remove_item(self, item_id: int):
+        """Drop every edge offering an item that is no longer available"""
+        with self._lock:
+            for edge_id in list(self.by_item.get(item_id, ())):
+                self.remove_edge(edge_id)
+
+    def copy(self) -> "BarterIndex":
+        """Consistent point-in-time copy for long-running batch work"""
+        with self._lock:
+            clone = BarterIndex()
+            clone.loaded = self.loaded
+            clone.edges = dict(self.edges)
+            for name in ("by_item_category", "by_want_category", "by_user", "by_item", "by_hostel_item_category",
+                         "by_hostel_want_category", "satisfies", "satisfied_by"):
+                setattr(clone, name, {key: set(values) for key, values in getattr(self, name).items()})
+            # Batch copies are read-only, so they share no vector state
+            clone.item_vectors = clone.want_vectors = None
+            return clone
+
+    def __getstate__(self):
+        # Locks cannot be pickled; worker processes get a fresh one
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    # Readers take the lock and get copies, so request threads can match while
+    # other threads add or remove edges
+
+    def edge(self, edge_id: int) -> Optional[IndexedEdge]:
+        """The indexed edge, or None if it has been removed"""
+        with self._lock:
+            return self.edges.get(edge_id)
+
+    def user_edges(self, user_id: int) -> List[IndexedEdge]:
+        with self._lock:
+            return [self.edges[eid] for eid in sorted(self.by_user.get(user_id, ()))]
+
+    def item_categories(self) -> List[str]:
+        with self._lock:
+            return list(self.by_item_category.keys())
+
+    def want_categories(self) -> List[str]:
+        with self._lock:
+            return list(self.by_want_category.keys())
+
+    def categories_satisfying(self, want_category: str) -> Set[str]:
+        """Item categories that satisfy a (normalized) want category"""
+        with self._lock:
+            return set(self.satisfies.get(want_category, ()))
+
+    def categories_satisfied_by(self, item_category: str) -> Set[str]:
+        """Want categories satisfied by a (normalized) item category"""
+        with self._lock:
+            return set(self.satisfied_by.get(item_category, ()))
+
+    def similar_item_categories(self, text: str, k: int = 5) -> List[tuple]:
+        """Top-k (item category, similarity) pairs closest to free text"""
+        with self._lock:
+            return self.item_vectors.query(text, k=k)
+
+    def edge_ids_having(self, item_category: str, hostel: Optional[str] = None) -> Set[int]:
+        """Ids of edges whose item is in the given (normalized) category, optionally in one hostel"""
+        with self._lock:
+            if hostel is not None:
+                return set(self.by_hostel_item_category.get((hostel, item_category), ()))
+            return set(self.by_item_category.get(item_category, ()))
+
+    def edge_ids_wanting(self, want_category: str, hostel: Optional[str] = None) -> Set[int]:
+        """Ids of edges that want the given (normalized) category, optionally in one hostel"""
+        with self._lock:
+            if hostel is not None:
+                return set(self.by_hostel_want_category.get((hostel, want_category), ()))
+            return set(self.by_want_category.get(want_category, ()))
+
+    def _add(self, edge: models.BarterEdge):
+        if edge.item is None or edge.user is None or (edge.item.status or "available") != "available":
+            return
+        entry = IndexedEdge(
+            edge_id=edge.id,
+            user_id=edge.user_id,
+            item_id=edge.item_id,
+            item_name=edge.item.name,
+            item_category=edge.item.category,
+            want_category=edge.want_category,
+            emergency=bool(edge.emergency),
+            user=UserSnapshot(
+                id=edge.user.id,
+                name=edge.user.name,
+                department=edge.user.department,
+                semester=edge.user.semester,
+                hostel=edge.user.hostel
+            )
+        )
+        item_key = normalize_category(entry.item_category)
+        want_key = normalize_category(entry.want_category)
+        if item_key not in self.by_item_category:
+            self._link_item_category(item_key)
+        if want_key not in self.by_want_category:
+            self._link_want_category(want_key)
+        self.edges[entry.edge_id] = entry
+        self.by_item_category.setdefault(item_key, set()).add(entry.edge_id)
+        self.by_want_category.setdefault(want_key, set()).add(entry.edge_id)
+        self.by_user.setdefault(entry.user_id, set()).add(entry.edge_id)
+        self.by_item.setdefault(entry.item_id, set()).add(entry.edge_id)
+        self.by_hostel_item_category.setdefault((entry.user.hostel, item_key), set()).add(entry.edge_id)
+        self.by_hostel_want_category.setdefault((entry.user.hostel, want_key), set()).add(entry.edge_id)
+
+    def _link_item_category(self, item_key: str):
+        """Connect a new item category to every want category it satisfies"""
+        table = get_similarity_table()
+        links = self.satisfied_by.setdefault(item_key, set())
+        if table.matcher == "semantic":
+            wants = [want for want, _ in self.want_vectors.query(item_key, min_score=MATCH_THRESHOLD)]
+        else:
+            wants = [want for want in self.by_want_category if table.score(item_key, want) >= MATCH_THRESHOLD]
+        for want in wants:
+            links.add(want)
+            self.satisfies.setdefault(want, set()).add(item_key)
+        self.item_vectors.add(item_key)
+
+    def _link_want_category(self, want_key: str):
+        """Connect a new want category to every item category that satisfies it"""
+        table = get_similarity_table()
+        links = self.satisfies.setdefault(want_key, set())
+        if table.matcher == "semantic":
+            items = [item for item, _ in self.item_vectors.query(want_key, min_score=MATCH_THRESHOLD)]
+        else:
+            items = [item for item in self.satisfied_by if table.score(item, want_key) >= MATCH_THRESHOLD]
+        for item in items:
+            links.add(item)
+            self.satisfied_by[item].add(want_key)
+        self.want_vectors.add(want_key)
+
+    @staticmethod
+    def _discard(buckets: Dict, key, edge_id: int):
+        bucket = buckets.get(key)
+        if bucket is None:
+            return
+        bucket.discard(edge_id)
+        if not bucket:
+            del buckets[key]
+
+# Singleton instance
+_barter_index = None
+
+def get_barter_index(db: Optional[Session] = None) -> BarterIndex:
+    """Get the singleton barter index, loading it from the database if needed"""
+    global _barter_index
+    if _barter_index is None:
+        _barter_index = BarterIndex()
+    if db is not None and not _barter_index.loaded:
+        from app import crud
+        with _barter_index._lock:
+            if not _barter_index.loaded:
+                _barter_index.rebuild(crud.get_active_barter_edges(db))
+    return _barter_index
@@ -0,0 +1,191 @@
+"""
+Bulk import of users, items and barter intents from JSON Lines or CSV.
+
+Rows are read lazily and handled a chunk at a time: the chunk is validated in
+one pass, checked against the database with a couple of IN queries (emails
+already taken, owners and items that do not exist), then written with a
+single executemany INSERT in its own transaction. Bad rows are reported by
+line number and skipped instead of aborting the import. No matching job is
+queued per intent; callers run one market-clearing sweep once the whole
+import is in.
+"""
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app import crud, schemas
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+import csv
+import json
+import os
+import time
+
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "5000"))
+MAX_REPORTED_ERRORS = 100
+
+FORMATS = {".jsonl": "jsonl", ".ndjson": "jsonl", ".json": "jsonl", ".csv": "csv"}
+
+class ImportReport:
+    """Running totals for one import; only the first MAX_REPORTED_ERRORS errors are kept"""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.imported = 0
+        self.failed = 0
+        self.errors: List[Dict] = []
+        self.started = time.perf_counter()
+
+    def error(self, line: int, message: str):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+    def to_dict(self) -> Dict:
+        elapsed = time.perf_counter() - self.started
+        received = self.imported + self.failed
+        return {
+            "kind": self.kind,
+            "received": received,
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": self.errors,
+            "duration_s": round(elapsed, 3),
+            "rows_per_s": round(received / elapsed, 1) if elapsed else 0.0
+        }
+
+def detect_format(filename: Optional[str]) -> str:
+    """jsonl or csv from a file name's extension"""
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Cannot tell the format of '{filename}'; use .jsonl or .csv")
+    return FORMATS[extension]
+
+def read_records(stream: TextIO, fmt: str, report: ImportReport) -> Iterator[Tuple[int, dict]]:
+    """(line number, record) for every row; unparseable lines go to the report"""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            # Empty cells mean "not given", so optional fields fall back to their defaults
+            yield reader.line_num, {key: value for key, value in row.items() if key and value not in ("", None)}
+    elif fmt == "jsonl":
+        for line, text in enumerate(stream, 1):
+            if not text.strip():
+                continue
+            try:
+                record = json.loads(text)
+            except json.JSONDecodeError as e:
+                report.error(line, f"Invalid JSON: {e.msg}")
+                continue
+            if isinstance(record, dict):
+                yield line, record
+            else:
+                report.error(line, "Expected a JSON object")
+    else:
+        raise ValueError(f"Unknown import format '{fmt}'")
+
+def _chunks(records: Iterable, size: int) -> Iterator[List]:
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _describe(errors: List[Dict]) -> str:
+    return "; ".join(f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}" for error in errors)
+
+def _validate(chunk: List[Tuple[int, dict]], schema, report: ImportReport) -> List[Tuple[int, BaseModel]]:
+    """Validate a whole chunk in one call, reporting and dropping the rows that fail"""
+    adapter = TypeAdapter(List[schema])
+    records = [record for _, record in chunk]
+    try:
+        return list(zip((line for line, _ in chunk), adapter.validate_python(records)))
+    except ValidationError as e:
+        failures: Dict[int, List[Dict]] = {}
+        for error in e.errors():
+            failures.setdefault(error["loc"][0], []).append({**error, "loc": error["loc"][1:]})
+    for position, errors in failures.items():
+        report.error(chunk[position][0], _describe(errors))
+    valid = [row for position, row in enumerate(chunk) if position not in failures]
+    return list(zip((line for line, _ in valid), adapter.validate_python([record for _, record in valid])))
+
+def _prepare_users(db: Session, chunk, report: ImportReport) -> Tuple[List[int], List[dict]]:
+    users = _validate(chunk, schemas.UserCreate, report)
+    taken = set(crud.get_user_ids_by_email(db, [user.email for _, user in users]))
+    lines, rows = [], []
+    for line, user in users:
+        if user.email in taken:
+            report.error(line, f"Email {user.email} already registered")
+            continue
+        taken.add(user.email)
+        lines.append(line)
+        rows.append(user.model_dump())
+    return lines, rows
+
+def _prepare_items(db: Session, chunk, report: ImportReport) -> Tuple[List[int], List[dict]]:
+    items = _validate(chunk, schemas.ItemImport, report)
+    owners = crud.get_user_ids_by_email(db, list({item.owner_email for _, item in items}))
+    lines, rows = [], []
+    for line, item in items:
+        owner_id = owners.get(item.owner_email)
+        if owner_id is None:
+            report.error(line, f"No user with email {item.owner_email}")
+            continue
+        lines.append(line)
+        rows.append({**item.model_dump(exclude={"owner_email"}), "owner_id": owner_id})
+    return lines, rows
+
+def _prepare_barter_intents(db: Session, chunk, report: ImportReport) -> Tuple[List[int], List[dict]]:
+    intents = _validate(chunk, schemas.BarterIntentImport, report)
+    owners = crud.get_user_ids_by_email(db, list({intent.owner_email for _, intent in intents}))
+    item_owners, items_by_name = {}, {}
+    for item_id, owner_id, name in crud.get_items_for_owners(db, list(set(owners.values()))):
+        item_owners[item_id] = owner_id
+        items_by_name[(owner_id, name)] = item_id  # oldest first, so the newest wins
+    lines, rows = [], []
+    for line, intent in intents:
+        owner_id = owners.get(intent.owner_email)
+        if owner_id is None:
+            report.error(line, f"No user with email {intent.owner_email}")
+            continue
+        if intent.item_id is not None:
+            item_id = intent.item_id if item_owners.get(intent.item_id) == owner_id else None
+        else:
+            item_id = items_by_name.get((owner_id, intent.item_name))
+        if item_id is None:
+            report.error(line, f"Item {intent.item_id or intent.item_name!r} not found or not owned by {intent.owner_email}")
+            continue
+        lines.append(line)
+        rows.append({
+            "user_id": owner_id,
+            "item_id": item_id,
+            "want_category": intent.want_category,
+            "want_description": intent.want_description,
+            "emergency": intent.emergency
+        })
+    return lines, rows
+
+# kind -> (prepare rows for a chunk, executemany insert)
+IMPORTERS: Dict[str, Tuple[Callable, Callable]] = {
+    "users": (_prepare_users, crud.create_users_bulk),
+    "items": (_prepare_items, crud.create_items_bulk),
+    "barter_intents": (_prepare_barter_intents, crud.create_barter_edges_bulk),
+}
+
+def import_records(db: Session, kind: str, stream: TextIO, fmt: str, chunk_size: int = IMPORT_CHUNK_SIZE) -> Dict:
+    """Import every row of a JSON Lines or CSV stream, one transaction per chunk"""
+    prepare, insert_rows = IMPORTERS[kind]
+    report = ImportReport(kind)
+    for chunk in _chunks(read_records(stream, fmt, report), chunk_size):
+        lines, rows = prepare(db, chunk, report)
+        try:
+            report.imported += insert_rows(db, rows)
+        except SQLAlchemyError as e:
+            db.rollback()
+            for line in lines:
+                report.error(line, f"Chunk rolled back: {getattr(e, 'orig', None) or e}")
+    result = report.to_dict()
+    print(f"📥 Imported {result['imported']}/{result['received']} {kind} in {result['duration_s']}s "
+          f"({result['rows_per_s']} rows/s)")
+    return result
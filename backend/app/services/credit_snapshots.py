@@ -0,0 +1,21 @@
+from app import crud
+from app.database import SessionLocal
+import asyncio
+
+def run_scheduled_snapshot() -> int:
+    """Snapshot eco-credit balances with its own session (for the background schedule)"""
+    db = SessionLocal()
+    try:
+        return crud.create_eco_credit_snapshots(db)
+    finally:
+        db.close()
+
+async def snapshot_loop(interval_seconds: int):
+    """Snapshot the eco-credit ledger every interval_seconds without blocking the event loop"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            count = await asyncio.to_thread(run_scheduled_snapshot)
+            print(f"📸 Eco-credit snapshot: {count} balances recorded")
+        except Exception as e:
+            print(f"❌ Eco-credit snapshot failed: {e}")
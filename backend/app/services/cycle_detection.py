@@ -0,0 +1,152 @@
+from sqlalchemy.orm import Session
+from app.services.barter_index import BarterIndex, get_barter_index, normalize_category
+from app.services.matching_engine import enumerate_cycles_parallel
+from scipy import sparse
+from typing import Dict, List, Optional
+import numpy as np
+import time
+
+def _ragged_arange(sizes: np.ndarray) -> np.ndarray:
+    """Concatenated arange(size) for every size, e.g. [2, 3] -> [0, 1, 0, 1, 2]"""
+    offsets = np.repeat(np.cumsum(sizes) - sizes, sizes)
+    return np.arange(int(sizes.sum())) - offsets
+
+def _lookup(matrix: sparse.spmatrix, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    """Entries matrix[rows[i], cols[i]] of a sparse matrix (0 where not stored)"""
+    coo = matrix.tocoo()
+    keys = coo.row.astype(np.int64) * matrix.shape[1] + coo.col
+    order = np.argsort(keys)
+    keys, data = keys[order], coo.data[order]
+    wanted = rows.astype(np.int64) * matrix.shape[1] + cols
+    if not len(keys):
+        return np.zeros(len(wanted))
+    positions = np.minimum(np.searchsorted(keys, wanted), len(keys) - 1)
+    return np.where(keys[positions] == wanted, data[positions], 0.0)
+
+class CycleParticipation:
+    """Per-edge counts of 2-way and 3-way swap cycles, from detect_cycle_participation"""
+
+    def __init__(self, edge_ids: np.ndarray, user_ids: np.ndarray,
+                 two_way: np.ndarray, three_way: np.ndarray):
+        self.edge_ids = edge_ids
+        self.user_ids = user_ids
+        self.two_way = two_way
+        self.three_way = three_way
+
+    def candidate_edge_ids(self) -> List[int]:
+        """Edges on at least one 2- or 3-cycle"""
+        return self.edge_ids[(self.two_way > 0) | (self.three_way > 0)].tolist()
+
+    def users_in_cycles(self) -> List[int]:
+        return np.unique(self.user_ids[(self.two_way > 0) | (self.three_way > 0)]).tolist()
+
+    def stranded_users(self) -> List[int]:
+        """Users with active intents but no 2- or 3-cycle through any of them"""
+        return np.setdiff1d(np.unique(self.user_ids), self.users_in_cycles()).tolist()
+
+def detect_cycle_participation(index: BarterIndex) -> CycleParticipation:
+    """
+    Count, for every active edge, the 2-way and 3-way swap cycles through it
+    with sparse matrix algebra instead of per-user searches.
+
+    The edge adjacency ("f has what e wants") factorizes as F = W·L·Hᵀ with
+    W (edges × want categories) and H (edges × item categories) one-hot and
+    L (want × item categories) the category graph. With M = Hᵀ·W, closed
+    walks through e are diag(F²)_e = (L·M·L)[a_e, b_e] and
+    diag(F³)_e = (L·M·L·M·L)[a_e, b_e], for e's want category a_e and item
+    category b_e, so only category-sized products are formed. Walks that
+    revisit a user (including an edge satisfying itself) are then subtracted
+    with corrections computed over same-user edge pairs and triples, which
+    leaves exact counts of cycles among distinct users.
+    """
+    edges = sorted(index.edges.values(), key=lambda edge: (edge.user_id, edge.edge_id))
+    n = len(edges)
+    edge_ids = np.array([edge.edge_id for edge in edges], dtype=np.int64)
+    user_ids = np.array([edge.user_id for edge in edges], dtype=np.int64)
+    if not n:
+        return CycleParticipation(edge_ids, user_ids, np.zeros(0), np.zeros(0))
+
+    wants = {category: i for i, category in enumerate(index.by_want_category)}
+    items = {category: i for i, category in enumerate(index.by_item_category)}
+    a = np.array([wants[normalize_category(edge.want_category)] for edge in edges], dtype=np.int64)
+    b = np.array([items[normalize_category(edge.item_category)] for edge in edges], dtype=np.int64)
+
+    links = [(wants[want], items[item]) for want, satisfying in index.satisfies.items()
+             for item in satisfying if want in wants and item in items]
+    L = sparse.csr_matrix(
+        (np.ones(len(links)), ([want for want, _ in links], [item for _, item in links])),
+        shape=(len(wants), len(items))
+    )
+    W = sparse.csr_matrix((np.ones(n), (np.arange(n), a)), shape=(n, len(wants)))
+    H = sparse.csr_matrix((np.ones(n), (np.arange(n), b)), shape=(n, len(items)))
+    M = (H.T @ W).tocsr()
+    LML = (L @ M @ L).tocsr()
+    LMLML = (LML @ M @ L).tocsr()
+
+    # Same-user groups are contiguous because edges are sorted by user
+    starts_of_user = np.r_[0, np.flatnonzero(np.diff(user_ids)) + 1]
+    sizes_of_user = np.diff(np.r_[starts_of_user, n])
+    start = np.repeat(starts_of_user, sizes_of_user)
+    size = np.repeat(sizes_of_user, sizes_of_user)
+
+    # Ordered same-user pairs (e, f), e == f included
+    pe = np.repeat(np.arange(n), size)
+    pf = start[pe] + _ragged_arange(size)
+    L_ef, L_fe = _lookup(L, a[pe], b[pf]), _lookup(L, a[pf], b[pe])
+
+    # 2-cycles: closed 2-walks minus those whose partner is the same user
+    two_way = _lookup(LML, a, b) - np.bincount(pe, L_ef * L_fe, minlength=n)
+
+    # 3-cycles: closed 3-walks e→f→g→e minus walks repeating a user, by
+    # inclusion-exclusion: U(f)=U(e), U(g)=U(e), U(f)=U(g), all three equal
+    same_first = np.bincount(pe, L_ef * _lookup(LML, a[pf], b[pe]), minlength=n)
+    same_last = np.bincount(pe, _lookup(LML, a[pe], b[pf]) * L_fe, minlength=n)
+    # Middle pair (f, g) of one user: sum over e of L[a_e, b_f]·L[a_g, b_e]
+    K = sparse.csr_matrix((L_ef, (b[pe], a[pf])), shape=(len(items), len(wants)))
+    same_middle = _lookup((L @ K @ L).tocsr(), a, b)
+    tp = np.repeat(np.arange(len(pe)), size[pf])
+    tg = start[pf][tp] + _ragged_arange(size[pf])
+    te, tf = pe[tp], pf[tp]
+    all_same = np.bincount(
+        te, L_ef[tp] * _lookup(L, a[tf], b[tg]) * _lookup(L, a[tg], b[te]), minlength=n
+    )
+    three_way = _lookup(LMLML, a, b) - (same_first + same_last + same_middle - 2 * all_same)
+
+    return CycleParticipation(edge_ids, user_ids, np.rint(two_way), np.rint(three_way))
+
+def run_cycle_sweep(db: Session, extract: bool = True, cycles_per_edge: int = 1,
+                    index: Optional[BarterIndex] = None) -> Dict:
+    """
+    Campus-wide sweep: find every user on a 2- or 3-cycle with
+    detect_cycle_participation, then (with extract) enumerate concrete cycles
+    only from the edges that are on one. Reports how many users are stranded.
+    """
+    started = time.perf_counter()
+    index = index or get_barter_index(db).copy()
+    participation = detect_cycle_participation(index)
+    detect_ms = (time.perf_counter() - started) * 1000
+
+    mark = time.perf_counter()
+    candidates = participation.candidate_edge_ids()
+    cycles = []
+    if extract:
+        cycles = enumerate_cycles_parallel(index, candidates, max_length=3, cycles_per_edge=cycles_per_edge)
+    extract_ms = (time.perf_counter() - mark) * 1000
+
+    stranded = participation.stranded_users()
+    return {
+        "active_edges": len(index.edges),
+        "users": len(index.by_user),
+        "users_in_cycles": len(participation.users_in_cycles()),
+        "stranded_users": len(stranded),
+        "stranded_user_ids": stranded[:100],
+        "edges_in_two_way_cycles": int((participation.two_way > 0).sum()),
+        "edges_in_three_way_cycles": int((participation.three_way > 0).sum()),
+        "candidate_edges": len(candidates),
+        "cycles_extracted": len(cycles),
+        "timings_ms": {
+            "detect_ms": round(detect_ms, 2),
+            "extract_ms": round(extract_ms, 2),
+            "total_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+    }
@@ -0,0 +1,69 @@
+from sqlalchemy.orm import Session
+from typing import Iterable, Optional, Sequence, Set
+import threading
+
+def cycle_signature(item_ids: Sequence[int]) -> str:
+    """
+    Canonical, rotation-invariant signature of a swap cycle: its item ids in
+    hand-off order, rotated to start at the smallest one. The same cycle found
+    from any participant gets the same signature; the reverse cycle does not.
+    """
+    item_ids = list(item_ids)
+    start = item_ids.index(min(item_ids))
+    return "-".join(str(item_id) for item_id in item_ids[start:] + item_ids[:start])
+
+def participants_signature(participants: Iterable[dict]) -> str:
+    """Signature of a match from its participant dicts (in cycle order)"""
+    return cycle_signature([participant["item_id"] for participant in participants])
+
+class LiveSignatureSet:
+    """
+    In-memory set of signatures of live (pending) matches, so the matching
+    engine can drop already-proposed cycles before scoring them and match
+    creation can skip duplicate inserts. `lock` serializes check-and-insert.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.loaded = False
+        self._signatures: Set[str] = set()
+
+    def load(self, signatures: Iterable[str]):
+        with self.lock:
+            self._signatures = {signature for signature in signatures if signature}
+            self.loaded = True
+
+    def invalidate(self):
+        """Drop the set so the next lookup reloads it from the database"""
+        with self.lock:
+            self.loaded = False
+
+    def __contains__(self, signature: str) -> bool:
+        return signature in self._signatures
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def add(self, signature: str):
+        with self.lock:
+            if self.loaded:
+                self._signatures.add(signature)
+
+    def discard(self, signature: Optional[str]):
+        with self.lock:
+            self._signatures.discard(signature)
+
+# Singleton instance
+_live_signatures = None
+
+def get_live_signatures(db: Optional[Session] = None) -> LiveSignatureSet:
+    """Get the singleton live signature set, loading it from the database if needed"""
+    global _live_signatures
+    if _live_signatures is None:
+        _live_signatures = LiveSignatureSet()
+    if db is not None and not _live_signatures.loaded:
+        from app import crud
+        with _live_signatures.lock:
+            if not _live_signatures.loaded:
+                _live_signatures.load(crud.get_live_cycle_signatures(db))
+    return _live_signatures
@@ -53,7 +53,7 @@ class GeminiItemAnalyzer:
             """
             
             # Generate content
-            response = self.model.generate_content([prompt, img])
+            response = await self.model.generate_content_async([prompt, img])
             
             # Parse JSON from response
             response_text = response.text.strip()
@@ -153,7 +153,7 @@ class GeminiItemAnalyzer:
             Keep it under 100 words.
             """
             
-            response = self.model.generate_content(prompt)
+            response = await self.model.generate_content_async(prompt)
             return response.text.strip()
         except:
             return "Great match found! Complete this swap to earn Eco-Credits and reduce campus waste."
@@ -0,0 +1,120 @@
+from sqlalchemy.orm import Session
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+import threading
+
+@dataclass
+class LeaderboardEntry:
+    user_id: int
+    user_name: str
+    department: str
+    total: int
+
+class Leaderboard:
+    """
+    In-memory eco-credit leaderboard kept in step with eco_credit_totals.
+    Users with a positive total are held in sorted (-total, user_id) key
+    lists, one campus-wide and one per department, so top-N reads are a
+    slice and rank lookups are a binary search. Ties share a rank.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.loaded = False
+        self.entries: Dict[int, LeaderboardEntry] = {}
+        self._ranking: List[Tuple[int, int]] = []
+        self._by_department: Dict[str, List[Tuple[int, int]]] = {}
+
+    def load(self, entries: Iterable[LeaderboardEntry]):
+        with self._lock:
+            self.entries.clear()
+            self._ranking = []
+            self._by_department = {}
+            for entry in entries:
+                if entry.total > 0:
+                    self.entries[entry.user_id] = entry
+                    self._ranking.append(self._key(entry))
+                    self._by_department.setdefault(entry.department, []).append(self._key(entry))
+            self._ranking.sort()
+            for keys in self._by_department.values():
+                keys.sort()
+            self.loaded = True
+
+    def invalidate(self):
+        """Drop the leaderboard so the next read reloads it from the database"""
+        with self._lock:
+            self.loaded = False
+
+    def update(self, user_id: int, user_name: str, department: str, total: int):
+        """Move a user to their new total (no-op until the leaderboard is first loaded)"""
+        with self._lock:
+            if not self.loaded:
+                return
+            previous = self.entries.pop(user_id, None)
+            if previous:
+                self._remove(self._ranking, self._key(previous))
+                self._remove(self._by_department[previous.department], self._key(previous))
+                if not self._by_department[previous.department]:
+                    del self._by_department[previous.department]
+            if total > 0:
+                entry = LeaderboardEntry(user_id, user_name, department, total)
+                self.entries[user_id] = entry
+                insort(self._ranking, self._key(entry))
+                insort(self._by_department.setdefault(department, []), self._key(entry))
+
+    def top(self, limit: int = 10, department: Optional[str] = None) -> List[Dict]:
+        with self._lock:
+            keys = self._keys(department)[:limit]
+            return [self._row(self.entries[user_id], keys) for _, user_id in keys]
+
+    def rank_of(self, user_id: int, department: Optional[str] = None) -> Optional[Dict]:
+        """A user's rank, campus-wide or within a department (None if not ranked)"""
+        with self._lock:
+            entry = self.entries.get(user_id)
+            if entry is None or (department is not None and entry.department != department):
+                return None
+            keys = self._keys(department)
+            row = self._row(entry, keys)
+            row["out_of"] = len(keys)
+            return row
+
+    def _keys(self, department: Optional[str]) -> List[Tuple[int, int]]:
+        if department is None:
+            return self._ranking
+        return self._by_department.get(department, [])
+
+    def _row(self, entry: LeaderboardEntry, keys: List[Tuple[int, int]]) -> Dict:
+        return {
+            # Users above with a strictly higher total, plus one
+            "rank": bisect_left(keys, (-entry.total,)) + 1,
+            "user_id": entry.user_id,
+            "user_name": entry.user_name,
+            "department": entry.department,
+            "total_eco_credits": entry.total
+        }
+
+    @staticmethod
+    def _key(entry: LeaderboardEntry) -> Tuple[int, int]:
+        return (-entry.total, entry.user_id)
+
+    @staticmethod
+    def _remove(keys: List[Tuple[int, int]], key: Tuple[int, int]):
+        position = bisect_left(keys, key)
+        if position < len(keys) and keys[position] == key:
+            del keys[position]
+
+# Singleton instance
+_leaderboard = None
+
+def get_leaderboard(db: Optional[Session] = None) -> Leaderboard:
+    """Get the singleton leaderboard, loading it from eco_credit_totals if needed"""
+    global _leaderboard
+    if _leaderboard is None:
+        _leaderboard = Leaderboard()
+    if db is not None and not _leaderboard.loaded:
+        from app import crud
+        with _leaderboard._lock:
+            if not _leaderboard.loaded:
+                _leaderboard.load(crud.get_leaderboard_entries(db))
+    return _leaderboard
@@ -0,0 +1,219 @@
+from sqlalchemy.orm import Session
+from app import crud
+from app.database import SessionLocal
+from app.services.barter_index import BarterIndex, get_barter_index
+from app.services.cycle_detection import detect_cycle_participation
+from app.services.matching_engine import enumerate_cycles_parallel
+from app.services.vector_scoring import ScoringArrays
+from typing import Dict, List, Set, Tuple
+import asyncio
+import os
+import time
+
+# Candidate generation bounds for a clearing run
+CLEARING_MAX_CYCLE_LENGTH = int(os.getenv("CLEARING_MAX_CYCLE_LENGTH", "3"))
+CLEARING_CYCLES_PER_EDGE = int(os.getenv("CLEARING_CYCLES_PER_EDGE", "10"))
+# Conflict components up to this many cycles are solved exactly
+EXACT_COMPONENT_SIZE = 20
+# Tie-breaker so that, at equal score, clearing more participants wins
+PARTICIPANT_WEIGHT = 0.001
+
+def match_type_for(length: int) -> str:
+    if length == 2:
+        return "direct"
+    if length == 3:
+        return "three_way"
+    return "multi_way"
+
+def _components(cycles: List[Tuple[int, ...]], items_of) -> List[List[int]]:
+    """Group cycle indices into components that share at least one item"""
+    parent = list(range(len(cycles)))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    owner = {}
+    for i, cycle in enumerate(cycles):
+        for item_id in items_of(cycle):
+            if item_id in owner:
+                parent[find(i)] = find(owner[item_id])
+            else:
+                owner[item_id] = i
+
+    groups = {}
+    for i in range(len(cycles)):
+        groups.setdefault(find(i), []).append(i)
+    return list(groups.values())
+
+def _solve_exact(members: List[int], weights: List[float], item_sets: List[Set[int]]) -> List[int]:
+    """Branch and bound over a small conflict component"""
+    order = sorted(members, key=lambda i: -weights[i])
+    best = ([], 0.0)
+    suffix = [0.0] * (len(order) + 1)
+    for pos in range(len(order) - 1, -1, -1):
+        suffix[pos] = suffix[pos + 1] + weights[order[pos]]
+
+    def search(pos, chosen, used, total):
+        nonlocal best
+        if total > best[1]:
+            best = (list(chosen), total)
+        if pos == len(order) or total + suffix[pos] <= best[1]:
+            return
+        i = order[pos]
+        if not (item_sets[i] & used):
+            chosen.append(i)
+            search(pos + 1, chosen, used | item_sets[i], total + weights[i])
+            chosen.pop()
+        search(pos + 1, chosen, used, total)
+
+    search(0, [], frozenset(), 0.0)
+    return best[0]
+
+def _solve_greedy(members: List[int], weights: List[float], item_sets: List[Set[int]]) -> List[int]:
+    """Greedy by weight, then try replacing each pick with a heavier disjoint group"""
+    order = sorted(members, key=lambda i: -weights[i])
+    holder = {}
+    chosen = set()
+    for i in order:
+        if not any(item in holder for item in item_sets[i]):
+            chosen.add(i)
+            for item in item_sets[i]:
+                holder[item] = i
+
+    # Unselected cycles blocked by exactly one selected cycle
+    freed_by = {}
+    for i in order:
+        if i in chosen:
+            continue
+        blockers = {holder[item] for item in item_sets[i] if item in holder}
+        if len(blockers) == 1:
+            freed_by.setdefault(blockers.pop(), []).append(i)
+
+    for picked in sorted(chosen, key=lambda i: weights[i]):
+        if picked not in chosen:
+            continue
+        replacement, used, total = [], set(), 0.0
+        for i in freed_by.get(picked, ()):
+            if item_sets[i] & used:
+                continue
+            if any(holder.get(item, picked) != picked for item in item_sets[i]):
+                continue
+            replacement.append(i)
+            used |= item_sets[i]
+            total += weights[i]
+        if total > weights[picked]:
+            chosen.discard(picked)
+            for item in item_sets[picked]:
+                holder.pop(item, None)
+            for i in replacement:
+                chosen.add(i)
+                for item in item_sets[i]:
+                    holder[item] = i
+    return sorted(chosen)
+
+def select_disjoint_cycles(cycles: List[Tuple[int, ...]], weights: List[float],
+                           index: BarterIndex) -> List[int]:
+    """
+    Choose a set of item-disjoint cycles maximizing total weight.
+    Small conflict components are solved exactly; large ones greedily with
+    a local-improvement pass. Returns selected cycle indices in order.
+    """
+    item_sets = [{index.edges[edge_id].item_id for edge_id in cycle} for cycle in cycles]
+    selected = []
+    for members in _components(cycles, lambda cycle: (index.edges[e].item_id for e in cycle)):
+        if len(members) == 1:
+            selected.extend(members)
+        elif len(members) <= EXACT_COMPONENT_SIZE:
+            selected.extend(_solve_exact(members, weights, item_sets))
+        else:
+            selected.extend(_solve_greedy(members, weights, item_sets))
+    return sorted(selected)
+
+def _participants(index: BarterIndex, cycle: Tuple[int, ...]) -> List[Dict]:
+    return [
+        {
+            "user_id": edge.user.id,
+            "user_name": edge.user.name,
+            "item_id": edge.item_id,
+            "item_name": edge.item_name,
+            "wants": edge.want_category
+        }
+        for edge in (index.edges[edge_id] for edge_id in cycle)
+    ]
+
+def run_market_clearing(db: Session, max_cycle_length: int = CLEARING_MAX_CYCLE_LENGTH,
+                        cycles_per_edge: int = CLEARING_CYCLES_PER_EDGE) -> Dict:
+    """
+    Clear the whole market in one batch: enumerate candidate cycles over all
+    active edges, pick a maximum-weight set of item-disjoint cycles (weight is
+    the summed hand-off score, emergency bonus included) and write every
+    resulting Match in a single transaction.
+    """
+    started = time.perf_counter()
+    timings = {}
+
+    index = get_barter_index(db).copy()
+    busy_items = crud.get_pending_match_item_ids(db)
+    timings["load_ms"] = (time.perf_counter() - started) * 1000
+
+    mark = time.perf_counter()
+    start_ids = list(index.edges)
+    if max_cycle_length <= 3:
+        # Only edges on some 2- or 3-cycle can start one
+        start_ids = detect_cycle_participation(index).candidate_edge_ids()
+    cycles = enumerate_cycles_parallel(
+        index, start_ids, max_length=max_cycle_length,
+        cycles_per_edge=cycles_per_edge, excluded_items=busy_items
+    )
+    timings["enumerate_ms"] = (time.perf_counter() - mark) * 1000
+
+    mark = time.perf_counter()
+    scores = ScoringArrays(index.edges.values()).cycle_scores(cycles).tolist()
+    weights = [score * len(cycle) + PARTICIPANT_WEIGHT * len(cycle) for score, cycle in zip(scores, cycles)]
+    selected = select_disjoint_cycles(cycles, weights, index)
+    timings["select_ms"] = (time.perf_counter() - mark) * 1000
+
+    mark = time.perf_counter()
+    new_matches = [
+        {
+            "user_id": index.edges[cycles[i][0]].user_id,
+            "match_type": match_type_for(len(cycles[i])),
+            "participants": _participants(index, cycles[i])
+        }
+        for i in selected
+    ]
+    match_ids = crud.create_matches_bulk(db, new_matches)
+    timings["write_ms"] = (time.perf_counter() - mark) * 1000
+    timings["total_ms"] = (time.perf_counter() - started) * 1000
+
+    return {
+        "active_edges": len(index.edges),
+        "candidate_cycles": len(cycles),
+        "selected_cycles": len(selected),
+        "matched_participants": sum(len(cycles[i]) for i in selected),
+        "total_score": round(sum(scores[i] * len(cycles[i]) for i in selected), 2),
+        "match_ids": match_ids,
+        "timings_ms": {name: round(value, 2) for name, value in timings.items()}
+    }
+
+def run_scheduled_clearing() -> Dict:
+    """Run one clearing pass with its own session (for the background schedule)"""
+    db = SessionLocal()
+    try:
+        return run_market_clearing(db)
+    finally:
+        db.close()
+
+async def clearing_loop(interval_seconds: int):
+    """Clear the market every interval_seconds without blocking the event loop"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            report = await asyncio.to_thread(run_scheduled_clearing)
+            print(f"♻️ Market clearing: {report['selected_cycles']} cycles from "
+                  f"{report['active_edges']} edges in {report['timings_ms']['total_ms']} ms")
+        except Exception as e:
+            print(f"❌ Market clearing failed: {e}")
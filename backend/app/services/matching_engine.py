@@ -1,12 +1,37 @@
 from sqlalchemy.orm import Session
-from app import models, crud
-from difflib import SequenceMatcher
-from typing import Dict, List, Optional
-import json
+from app import models
+from app.services.barter_index import BarterIndex, get_barter_index, normalize_category
+from app.services.cycle_signatures import cycle_signature, get_live_signatures
+from app.services.similarity import similarity_score, get_similarity_table, MATCH_THRESHOLD
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+import heapq
+import itertools
+import multiprocessing
+import os
+import time
 
-def similarity_score(a: str, b: str) -> float:
-    """Calculate similarity between two strings using SequenceMatcher"""
-    return SequenceMatcher(None, a.lower(), b.lower()).ratio()
+# Bounds for the general k-way cycle search (kept small for the request path)
+MAX_CYCLE_LENGTH = int(os.getenv("MATCHING_MAX_CYCLE_LENGTH", "5"))
+MAX_EXPANSIONS = int(os.getenv("MATCHING_MAX_EXPANSIONS", "20000"))
+TIME_BUDGET_MS = float(os.getenv("MATCHING_TIME_BUDGET_MS", "50"))
+# Number of ranked suggestions returned by default
+TOP_K = int(os.getenv("MATCHING_TOP_K", "5"))
+# Tighter budget for the hostel-local emergency fast path
+EMERGENCY_MAX_EXPANSIONS = int(os.getenv("EMERGENCY_MAX_EXPANSIONS", "2000"))
+EMERGENCY_TIME_BUDGET_MS = float(os.getenv("EMERGENCY_TIME_BUDGET_MS", "10"))
+
+# Process pool for campus-wide sweeps (0 workers = one per CPU)
+SWEEP_WORKERS = int(os.getenv("MATCHING_SWEEP_WORKERS", "0"))
+# The pool is created per sweep, because every sweep searches a different
+# snapshot: each call spawns fresh interpreters that import the app and
+# unpickle the whole snapshot (~0.9MB at 5k edges, ~3.3MB at 20k). On the
+# synthetic campus of benchmark_matching.py that startup took 3-6s, while a
+# serial sweep took 1.2s at 5k edges and 6.5s at 20k. Below ~20k edges the
+# startup costs more than the workers save, so those sweeps stay serial.
+PARALLEL_MIN_EDGES = int(os.getenv("MATCHING_PARALLEL_MIN_EDGES", "20000"))
+SWEEP_START_METHOD = os.getenv("MATCHING_SWEEP_START_METHOD", "spawn")
 
 def calculate_match_score(user_a: models.User, user_b: models.User, 
                          edge_a: models.BarterEdge, edge_b: models.BarterEdge,
@@ -32,171 +57,553 @@ def calculate_match_score(user_a: models.User, user_b: models.User,
     
     return score
 
+def calculate_cycle_score(cycle: List) -> float:
+    """
+    Cycle-aware match score. A 2-way cycle scores exactly like
+    calculate_match_score; longer cycles average the score of every hand-off
+    (each participant and the next one in the cycle).
+    """
+    if len(cycle) == 2:
+        edge_a, edge_b = cycle
+        return calculate_match_score(
+            edge_a.user, edge_b.user, edge_a, edge_b,
+            is_emergency=(edge_a.emergency or edge_b.emergency)
+        )
+    total = 0.0
+    for position, edge in enumerate(cycle):
+        following = cycle[(position + 1) % len(cycle)]
+        total += calculate_match_score(
+            edge.user, following.user, edge, following,
+            is_emergency=(edge.emergency or following.emergency)
+        )
+    return total / len(cycle)
+
 def item_matches_want(item_category: str, want_category: str) -> float:
-    """Check if item category matches what user wants"""
-    return similarity_score(item_category, want_category)
+    """Check if item category matches what user wants (memoized per category pair)"""
+    return get_similarity_table().score(item_category, want_category)
 
-def find_direct_match(db: Session, user_id: int) -> Optional[Dict]:
-    """Find 2-way direct swap: A has what B wants, B has what A wants"""
-    
-    # Get user's active barter edges
-    user_edges = crud.get_user_barter_edges(db, user_id)
-    if not user_edges:
-        return None
-    
-    # Get all other active barter edges
-    all_edges = crud.get_active_barter_edges(db)
-    
+def _edges_having_like(index: BarterIndex, want_category: str, cache: Dict,
+                       hostel: Optional[str] = None) -> Set[int]:
+    """Ids of indexed edges whose item category matches a wanted category"""
+    want_category = normalize_category(want_category)
+    key = ("has", want_category, hostel)
+    if key not in cache:
+        ids = set()
+        for category in index.categories_satisfying(want_category):
+            ids |= index.edge_ids_having(category, hostel)
+        cache[key] = ids
+    return cache[key]
+
+def _edges_wanting_like(index: BarterIndex, item_category: str, cache: Dict,
+                        hostel: Optional[str] = None) -> Set[int]:
+    """Ids of indexed edges whose want category matches an item category"""
+    item_category = normalize_category(item_category)
+    key = ("wants", item_category, hostel)
+    if key not in cache:
+        ids = set()
+        for category in index.categories_satisfied_by(item_category):
+            ids |= index.edge_ids_wanting(category, hostel)
+        cache[key] = ids
+    return cache[key]
+
+def _start_edges(index: BarterIndex, user_id: int, edge_id: Optional[int]) -> List:
+    """The user's edges to search from: just edge_id when given, else all of them"""
+    if edge_id is None:
+        return index.user_edges(user_id)
+    edge = index.edge(edge_id)
+    return [edge] if edge and edge.user_id == user_id else []
+
+def _participant(edge) -> Dict:
+    return {
+        "user_id": edge.user.id,
+        "user_name": edge.user.name,
+        "item_id": edge.item_id,
+        "item_name": edge.item_name,
+        "wants": edge.want_category
+    }
+
+def _is_live(cycle, live) -> bool:
+    """Whether a cycle of indexed edges is already proposed as a pending match"""
+    return live is not None and cycle_signature([edge.item_id for edge in cycle]) in live
+
+def _direct_cycles(index: BarterIndex, user_edges: List, lookups: Dict,
+                   budget: Optional["SearchBudget"] = None, hostel: Optional[str] = None):
+    """Yield (my_edge, other_edge) 2-way swaps in edge id order (optionally within one hostel)"""
     for my_edge in user_edges:
-        my_item = crud.get_item(db, my_edge.item_id)
-        my_user = crud.get_user(db, user_id)
+        # Candidates must have what I want AND want what I have
+        candidates = _edges_having_like(index, my_edge.want_category, lookups, hostel) & \
+            _edges_wanting_like(index, my_edge.item_category, lookups, hostel)
         
-        if not my_item or not my_user:
+        for other_id in sorted(candidates):
+            other_edge = index.edge(other_id)
+            if other_edge is None or other_edge.user_id == my_edge.user_id:
+                continue
+            if budget and not budget.spend():
+                return
+            yield (my_edge, other_edge)
+
+def _three_way_cycles(index: BarterIndex, user_edges: List, lookups: Dict,
+                      budget: Optional["SearchBudget"] = None, hostel: Optional[str] = None):
+    """Yield (edge_a, edge_b, edge_c) 3-way cycles in edge id order (optionally within one hostel)"""
+    for edge_a in user_edges:
+        # C must want what A has
+        wants_a = _edges_wanting_like(index, edge_a.item_category, lookups, hostel)
+        if not wants_a:
             continue
         
-        for other_edge in all_edges:
-            if other_edge.user_id == user_id:
-                continue
-            
-            other_item = crud.get_item(db, other_edge.item_id)
-            other_user = crud.get_user(db, other_edge.user_id)
-            
-            if not other_item or not other_user:
+        # Find B: someone who has what A wants
+        for b_id in sorted(_edges_having_like(index, edge_a.want_category, lookups, hostel)):
+            edge_b = index.edge(b_id)
+            if edge_b is None or edge_b.user_id == edge_a.user_id:
                 continue
+            if budget and not budget.spend():
+                return
             
-            # Check if mutual match exists
-            i_want_their_item = item_matches_want(other_item.category, my_edge.want_category)
-            they_want_my_item = item_matches_want(my_item.category, other_edge.want_category)
-            
-            if i_want_their_item >= 0.7 and they_want_my_item >= 0.7:
-                # Calculate match quality score
-                match_score = calculate_match_score(
-                    my_user, other_user, my_edge, other_edge,
-                    is_emergency=(my_edge.emergency or other_edge.emergency)
-                )
-                
-                participants = [
-                    {
-                        "user_id": my_user.id,
-                        "user_name": my_user.name,
-                        "item_id": my_item.id,
-                        "item_name": my_item.name,
-                        "wants": my_edge.want_category
-                    },
-                    {
-                        "user_id": other_user.id,
-                        "user_name": other_user.name,
-                        "item_id": other_item.id,
-                        "item_name": other_item.name,
-                        "wants": other_edge.want_category
-                    }
-                ]
-                
-                return {
-                    "type": "direct",
-                    "participants": participants,
-                    "match_score": match_score,
-                    "explanation": f"Perfect 2-way match found! {my_user.name} and {other_user.name} have what each other wants.",
-                    "flow": f"{my_user.name} ({my_item.name}) ↔ {other_user.name} ({other_item.name})"
-                }
+            # Find C: someone who has what B wants AND wants what A has
+            candidates = _edges_having_like(index, edge_b.want_category, lookups, hostel) & wants_a
+            for c_id in sorted(candidates):
+                edge_c = index.edge(c_id)
+                if edge_c is None or edge_c.user_id in [edge_a.user_id, edge_b.user_id]:
+                    continue
+                yield (edge_a, edge_b, edge_c)
+
+def _direct_result(my_edge, other_edge) -> Dict:
+    my_user, other_user = my_edge.user, other_edge.user
+    
+    # Calculate match quality score
+    match_score = calculate_match_score(
+        my_user, other_user, my_edge, other_edge,
+        is_emergency=(my_edge.emergency or other_edge.emergency)
+    )
+    
+    return {
+        "type": "direct",
+        "participants": [_participant(my_edge), _participant(other_edge)],
+        "match_score": match_score,
+        "explanation": f"Perfect 2-way match found! {my_user.name} and {other_user.name} have what each other wants.",
+        "flow": f"{my_user.name} ({my_edge.item_name}) ↔ {other_user.name} ({other_edge.item_name})"
+    }
+
+def _three_way_result(edge_a, edge_b, edge_c) -> Dict:
+    user_a, user_b, user_c = edge_a.user, edge_b.user, edge_c.user
+    
+    return {
+        "type": "three_way",
+        "participants": [_participant(edge_a), _participant(edge_b), _participant(edge_c)],
+        "explanation": f"Amazing 3-way circular swap detected! {user_a.name}, {user_b.name}, and {user_c.name} form a perfect cycle.",
+        "flow": f"{user_a.name} ({edge_a.item_name}) → {user_b.name} ({edge_b.item_name}) → {user_c.name} ({edge_c.item_name}) → {user_a.name}"
+    }
+
+def find_direct_match(db: Session, user_id: int, edge_id: Optional[int] = None) -> Optional[Dict]:
+    """Find 2-way direct swap: A has what B wants, B has what A wants"""
+    
+    index = get_barter_index(db)
+    user_edges = _start_edges(index, user_id, edge_id)
+    
+    for cycle in _direct_cycles(index, user_edges, {}):
+        return _direct_result(*cycle)
     
     return None
 
-def find_three_way_cycle(db: Session, user_id: int) -> Optional[Dict]:
+def find_three_way_cycle(db: Session, user_id: int, edge_id: Optional[int] = None) -> Optional[Dict]:
     """Find 3-way cycle: A→B→C→A where each has what the next wants"""
     
-    user_edges = crud.get_user_barter_edges(db, user_id)
-    if not user_edges:
-        return None
+    index = get_barter_index(db)
+    user_edges = _start_edges(index, user_id, edge_id)
     
-    all_edges = crud.get_active_barter_edges(db)
+    for cycle in _three_way_cycles(index, user_edges, {}):
+        return _three_way_result(*cycle)
     
-    for edge_a in user_edges:
-        item_a = crud.get_item(db, edge_a.item_id)
-        user_a = crud.get_user(db, user_id)
-        
-        if not item_a or not user_a:
-            continue
-        
-        # Find B: someone who has what A wants
-        for edge_b in all_edges:
-            if edge_b.user_id == user_id:
-                continue
-            
-            item_b = crud.get_item(db, edge_b.item_id)
-            user_b = crud.get_user(db, edge_b.user_id)
-            
-            if not item_b or not user_b:
+    return None
+
+class SearchBudget:
+    """Expansion and wall-clock budget shared by one cycle search"""
+
+    def __init__(self, max_expansions: int = MAX_EXPANSIONS, time_budget_ms: float = TIME_BUDGET_MS):
+        self.max_expansions = max_expansions
+        self.deadline = time.perf_counter() + time_budget_ms / 1000.0
+        self.expansions = 0
+        self.exhausted = False
+
+    def spend(self) -> bool:
+        """Count one node expansion; returns False once the budget is used up"""
+        self.expansions += 1
+        if self.expansions > self.max_expansions or \
+                (self.expansions % 64 == 0 and time.perf_counter() > self.deadline):
+            self.exhausted = True
+        return not self.exhausted
+
+def _hops_back_to(index: BarterIndex, start, max_hops: int, lookups: Dict) -> Dict[int, int]:
+    """
+    Backward BFS over the have→want graph: minimum number of hand-offs from
+    each edge back to the start edge, up to max_hops. Used to prune paths
+    that can no longer close within the length bound.
+    """
+    hops = {start.edge_id: 0}
+    frontier = [start]
+    for depth in range(1, max_hops + 1):
+        next_frontier = []
+        for edge in frontier:
+            # Anyone who wants this edge's item can hand off to it
+            for edge_id in _edges_wanting_like(index, edge.item_category, lookups):
+                if edge_id not in hops:
+                    wanting = index.edge(edge_id)
+                    if wanting is None:
+                        continue
+                    hops[edge_id] = depth
+                    next_frontier.append(wanting)
+        if not next_frontier:
+            break
+        frontier = next_frontier
+    return hops
+
+def _find_cycle_from(index: BarterIndex, start, length: int, hops: Dict[int, int],
+                     budget: SearchBudget, lookups: Dict, live=None) -> Optional[List]:
+    """
+    Depth-first search for a cycle of exactly `length` distinct users through
+    start, skipping cycles whose signature is in `live`
+    """
+    path = [start]
+    users = {start.user_id}
+
+    def extend() -> bool:
+        if not budget.spend():
+            return False
+        current = path[-1]
+        remaining = length - len(path)
+        if remaining == 0:
+            # Close the cycle: start must have what the last edge wants
+            return hops.get(current.edge_id) == 1 and not _is_live(path, live)
+        for edge_id in sorted(_edges_having_like(index, current.want_category, lookups)):
+            # Prune edges that cannot get back to start in the hops left
+            if hops.get(edge_id, length) > remaining:
                 continue
-            
-            # Check if B has what A wants
-            if item_matches_want(item_b.category, edge_a.want_category) < 0.7:
+            edge = index.edge(edge_id)
+            if edge is None or edge.user_id in users:
                 continue
-            
-            # Find C: someone who has what B wants
-            for edge_c in all_edges:
-                if edge_c.user_id in [user_id, edge_b.user_id]:
+            path.append(edge)
+            users.add(edge.user_id)
+            if extend():
+                return True
+            path.pop()
+            users.discard(edge.user_id)
+            if budget.exhausted:
+                return False
+        return False
+
+    return list(path) if extend() else None
+
+def find_k_way_cycle(db: Session, user_id: int, min_length: int = 4,
+                     max_length: int = MAX_CYCLE_LENGTH,
+                     max_expansions: int = MAX_EXPANSIONS,
+                     time_budget_ms: float = TIME_BUDGET_MS,
+                     edge_id: Optional[int] = None) -> Optional[Dict]:
+    """
+    Find a bounded-length swap cycle (4- and 5-party swaps by default).
+    Shorter cycles are tried first; the search stops when the expansion or
+    time budget runs out.
+    """
+    
+    index = get_barter_index(db)
+    user_edges = _start_edges(index, user_id, edge_id)
+    if not user_edges or max_length < min_length:
+        return None
+    
+    budget = SearchBudget(max_expansions, time_budget_ms)
+    lookups = {}
+    live = get_live_signatures(db)
+    reachable = {edge.edge_id: _hops_back_to(index, edge, max_length - 1, lookups) for edge in user_edges}
+    
+    for length in range(min_length, max_length + 1):
+        for start in user_edges:
+            cycle = _find_cycle_from(index, start, length, reachable[start.edge_id], budget, lookups, live)
+            if cycle:
+                return _multi_way_result(cycle)
+            if budget.exhausted:
+                return None
+    
+    return None
+
+def _multi_way_result(cycle: List) -> Dict:
+    participants = [_participant(edge) for edge in cycle]
+    names = [edge.user.name for edge in cycle]
+    flow = " → ".join(f"{edge.user.name} ({edge.item_name})" for edge in cycle)
+    
+    return {
+        "type": "multi_way",
+        "cycle_length": len(cycle),
+        "participants": participants,
+        "explanation": f"Incredible {len(cycle)}-way circular swap detected! {', '.join(names[:-1])}, and {names[-1]} form a perfect cycle.",
+        "flow": f"{flow} → {cycle[0].user.name}"
+    }
+
+def _cycle_result(cycle) -> Dict:
+    if len(cycle) == 2:
+        return _direct_result(*cycle)
+    if len(cycle) == 3:
+        return _three_way_result(*cycle)
+    return _multi_way_result(cycle)
+
+def find_ranked_matches(db: Session, user_id: int, k: int = TOP_K,
+                        edge_id: Optional[int] = None,
+                        max_expansions: int = MAX_EXPANSIONS,
+                        time_budget_ms: float = TIME_BUDGET_MS,
+                        hostel: Optional[str] = None) -> List[Dict]:
+    """
+    Rank 2-way and 3-way candidates by calculate_cycle_score and return the
+    best k. A bounded min-heap keeps only k candidates in memory; ties go to
+    shorter cycles, then to the one found first. With hostel, only partners
+    living in that hostel are considered. Cycles already proposed as a
+    pending match are skipped before scoring (the barter index only holds
+    edges whose item is still available).
+    """
+    
+    index = get_barter_index(db)
+    user_edges = _start_edges(index, user_id, edge_id)
+    # Each shape gets its own share of the budget, so a market full of 2-way
+    # candidates cannot starve the 3-way search. The 3-way share keeps the
+    # full deadline and so also gets whatever time the 2-way search leaves.
+    direct_share = max(1, max_expansions // 2)
+    direct_budget = SearchBudget(direct_share, time_budget_ms / 2)
+    three_way_budget = SearchBudget(max(1, max_expansions - direct_share), time_budget_ms)
+    lookups = {}
+    live = get_live_signatures(db)
+    heap = []
+    
+    candidates = itertools.chain(
+        _direct_cycles(index, user_edges, lookups, direct_budget, hostel),
+        _three_way_cycles(index, user_edges, lookups, three_way_budget, hostel)
+    )
+    for sequence, cycle in enumerate(candidates):
+        if _is_live(cycle, live):
+            continue
+        entry = (calculate_cycle_score(cycle), -len(cycle), -sequence, cycle)
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+    
+    ranked = []
+    for rank, (score, _, _, cycle) in enumerate(sorted(heap, reverse=True), start=1):
+        result = _cycle_result(cycle)
+        result["match_score"] = score
+        result["rank"] = rank
+        ranked.append(result)
+    return ranked
+
+def find_emergency_match(db: Session, user_id: int, edge_id: int,
+                         max_expansions: int = EMERGENCY_MAX_EXPANSIONS,
+                         time_budget_ms: float = EMERGENCY_TIME_BUDGET_MS) -> Optional[Dict]:
+    """
+    Emergency fast path: best 2-way or 3-way swap among edges in the
+    requester's own hostel. Only the hostel buckets of the barter index are
+    touched, so latency depends on the size of that hostel's market, not on
+    the whole campus.
+    """
+    
+    index = get_barter_index(db)
+    edge = index.edge(edge_id)
+    if edge is None or edge.user_id != user_id:
+        return None
+    
+    ranked = find_ranked_matches(
+        db, user_id, k=1, edge_id=edge_id, max_expansions=max_expansions,
+        time_budget_ms=time_budget_ms, hostel=edge.user.hostel
+    )
+    return ranked[0] if ranked else None
+
+class CycleGraph:
+    """Category-level view of the market used to enumerate cycles quickly"""
+
+    def __init__(self, index: BarterIndex):
+        self.index = index
+        # want category <-> item categories, maintained by the barter index
+        self.satisfies = index.satisfies
+        self.satisfied_by = index.satisfied_by
+        # want category -> item categories of the edges wanting it
+        self.offered_for: Dict[str, Set[str]] = {}
+        for edge in index.edges.values():
+            self.offered_for.setdefault(normalize_category(edge.want_category), set()).add(
+                normalize_category(edge.item_category)
+            )
+        self._hops: Dict[Tuple[str, int], Dict[str, int]] = {}
+        self._successors: Dict[str, Tuple[List[int], Set[int]]] = {}
+
+    def successors(self, edge) -> Tuple[List[int], Set[int]]:
+        """Ids of edges that have what this edge wants, as a sorted list and a set"""
+        want = normalize_category(edge.want_category)
+        if want not in self._successors:
+            ids = set()
+            for item in self.satisfies.get(want, ()):
+                ids |= self.index.edge_ids_having(item)
+            self._successors[want] = (sorted(ids), ids)
+        return self._successors[want]
+
+    def hops_to(self, item_category: str, max_hops: int) -> Dict[str, int]:
+        """
+        Lower bound on hand-offs needed from an edge wanting each category to
+        reach an edge holding `item_category` (ignores distinct-user rules).
+        """
+        item_category = normalize_category(item_category)
+        key = (item_category, max_hops)
+        if key not in self._hops:
+            hops = {want: 1 for want in self.satisfied_by.get(item_category, ())}
+            frontier = list(hops)
+            for depth in range(2, max_hops + 1):
+                next_frontier = []
+                for want in frontier:
+                    # Edges holding these items want something else first
+                    for item in self.offered_for.get(want, ()):
+                        for prev_want in self.satisfied_by.get(item, ()):
+                            if prev_want not in hops:
+                                hops[prev_want] = depth
+                                next_frontier.append(prev_want)
+                frontier = next_frontier
+            self._hops[key] = hops
+        return self._hops[key]
+
+def enumerate_cycles(index: BarterIndex, start_ids: Iterable[int],
+                     max_length: int = 3,
+                     cycles_per_edge: int = 10,
+                     excluded_items: Optional[Set[int]] = None,
+                     graph: Optional[CycleGraph] = None) -> List[Tuple[int, ...]]:
+    """
+    Enumerate candidate cycles (as tuples of edge ids) of 2..max_length
+    distinct users. Each cycle is reported once, from its lowest edge id,
+    and at most cycles_per_edge cycles are kept per starting edge.
+    """
+    graph = graph or CycleGraph(index)
+    excluded_items = excluded_items or set()
+    cycles = []
+
+    for start_id in sorted(start_ids):
+        start = index.edges.get(start_id)
+        if start is None or start.item_id in excluded_items:
+            continue
+        hops = graph.hops_to(start.item_category, max_length)
+        if hops.get(normalize_category(start.want_category), max_length + 1) > max_length:
+            # Nothing start wants can lead back to it within the length bound
+            continue
+        found = []
+        path = [start]
+        users = {start.user_id}
+
+        def extend():
+            current = path[-1]
+            ordered, members = graph.successors(current)
+            if len(path) >= 2 and start_id in members:
+                found.append(tuple(e.edge_id for e in path))
+            remaining = max_length - len(path)
+            if remaining == 0:
+                return
+            # Only visit edges above start so each cycle is seen once
+            for edge_id in ordered[bisect_right(ordered, start_id):]:
+                if len(found) >= cycles_per_edge:
+                    return
+                edge = index.edges[edge_id]
+                if edge.user_id in users or edge.item_id in excluded_items:
                     continue
-                
-                item_c = crud.get_item(db, edge_c.item_id)
-                user_c = crud.get_user(db, edge_c.user_id)
-                
-                if not item_c or not user_c:
+                if hops.get(normalize_category(edge.want_category), max_length) > remaining:
                     continue
-                
-                # Check if C has what B wants AND C wants what A has
-                b_wants_c = item_matches_want(item_c.category, edge_b.want_category)
-                c_wants_a = item_matches_want(item_a.category, edge_c.want_category)
-                
-                if b_wants_c >= 0.7 and c_wants_a >= 0.7:
-                    # Found a 3-way cycle!
-                    participants = [
-                        {
-                            "user_id": user_a.id,
-                            "user_name": user_a.name,
-                            "item_id": item_a.id,
-                            "item_name": item_a.name,
-                            "wants": edge_a.want_category
-                        },
-                        {
-                            "user_id": user_b.id,
-                            "user_name": user_b.name,
-                            "item_id": item_b.id,
-                            "item_name": item_b.name,
-                            "wants": edge_b.want_category
-                        },
-                        {
-                            "user_id": user_c.id,
-                            "user_name": user_c.name,
-                            "item_id": item_c.id,
-                            "item_name": item_c.name,
-                            "wants": edge_c.want_category
-                        }
-                    ]
-                    
-                    return {
-                        "type": "three_way",
-                        "participants": participants,
-                        "explanation": f"Amazing 3-way circular swap detected! {user_a.name}, {user_b.name}, and {user_c.name} form a perfect cycle.",
-                        "flow": f"{user_a.name} ({item_a.name}) → {user_b.name} ({item_b.name}) → {user_c.name} ({item_c.name}) → {user_a.name}"
-                    }
+                path.append(edge)
+                users.add(edge.user_id)
+                extend()
+                path.pop()
+                users.discard(edge.user_id)
+
+        extend()
+        cycles.extend(found)
+
+    return cycles
+
+# Worker-process state for parallel sweeps (set once per worker by the initializer)
+_worker_index = None
+_worker_graph = None
+_worker_excluded = None
+
+def _init_sweep_worker(index: BarterIndex, excluded_items: Set[int]):
+    global _worker_index, _worker_graph, _worker_excluded
+    _worker_index = index
+    _worker_graph = CycleGraph(index)
+    _worker_excluded = excluded_items
+
+def _sweep_shard(task: Tuple[List[int], int, int]) -> List[Tuple[int, ...]]:
+    start_ids, max_length, cycles_per_edge = task
+    return enumerate_cycles(
+        _worker_index, start_ids, max_length=max_length, cycles_per_edge=cycles_per_edge,
+        excluded_items=_worker_excluded, graph=_worker_graph
+    )
+
+def enumerate_cycles_parallel(index: BarterIndex, start_ids: Iterable[int],
+                              max_length: int = 3, cycles_per_edge: int = 10,
+                              excluded_items: Optional[Set[int]] = None,
+                              workers: int = SWEEP_WORKERS,
+                              min_edges: int = PARALLEL_MIN_EDGES) -> List[Tuple[int, ...]]:
+    """
+    enumerate_cycles sharded by starting edge across a process pool. The
+    market snapshot is shipped to each worker once through the pool
+    initializer; shards are small contiguous id ranges whose results are
+    concatenated in shard order, so the output is identical to a serial run.
+    Every call pays the pool's startup (see PARALLEL_MIN_EDGES), so small
+    markets (or a single worker) are searched serially.
+    """
+    start_ids = sorted(start_ids)
+    excluded_items = excluded_items or set()
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(start_ids) < min_edges:
+        return enumerate_cycles(index, start_ids, max_length, cycles_per_edge, excluded_items)
     
-    return None
+    # Several shards per worker so that uneven shards balance out
+    shard_size = max(1, len(start_ids) // (workers * 8))
+    tasks = [
+        (start_ids[i:i + shard_size], max_length, cycles_per_edge)
+        for i in range(0, len(start_ids), shard_size)
+    ]
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context(SWEEP_START_METHOD),
+        initializer=_init_sweep_worker,
+        initargs=(index, excluded_items)
+    ) as pool:
+        shards = list(pool.map(_sweep_shard, tasks))
+    
+    return [cycle for shard in shards for cycle in shard]
 
-def run_matching(db: Session, user_id: int) -> Optional[Dict]:
+def run_matching(db: Session, user_id: int, edge_id: Optional[int] = None,
+                 max_cycle_length: int = MAX_CYCLE_LENGTH,
+                 max_expansions: int = MAX_EXPANSIONS,
+                 time_budget_ms: float = TIME_BUDGET_MS) -> Optional[Dict]:
     """
-    Orchestrate matching: try direct match first, then 3-way cycle
+    Orchestrate matching: take the best-scoring 2-way or 3-way candidate,
+    then fall back to longer cycles up to max_cycle_length within the search budget.
+    With edge_id (a newly created intent) only cycles through that edge are
+    searched, since the user's older edges were already searched when posted.
+    Emergency intents try the hostel-local fast path first.
     Returns match details or None if no match found
     """
     
-    # Try direct match first (faster and simpler)
-    direct_match = find_direct_match(db, user_id)
-    if direct_match:
-        return direct_match
+    if edge_id is not None:
+        edge = get_barter_index(db).edge(edge_id)
+        if edge is not None and edge.emergency:
+            emergency_match = find_emergency_match(db, user_id, edge_id)
+            if emergency_match:
+                return emergency_match
+    
+    # Best-scoring 2-way or 3-way candidate
+    ranked = find_ranked_matches(
+        db, user_id, k=1, edge_id=edge_id,
+        max_expansions=max_expansions, time_budget_ms=time_budget_ms
+    )
+    if ranked:
+        return ranked[0]
     
-    # Try 3-way cycle if no direct match
-    three_way_match = find_three_way_cycle(db, user_id)
-    if three_way_match:
-        return three_way_match
+    # Try 4+-way cycles within the search budget
+    multi_way_match = find_k_way_cycle(
+        db, user_id, min_length=4, max_length=max_cycle_length,
+        max_expansions=max_expansions, time_budget_ms=time_budget_ms,
+        edge_id=edge_id
+    )
+    if multi_way_match:
+        return multi_way_match
     
     return None
@@ -0,0 +1,221 @@
+from app import crud
+from app.database import SessionLocal
+from app.services.matching_engine import run_matching
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import itertools
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+MATCHING_WORKERS = int(os.getenv("MATCHING_WORKERS", "2"))
+# "background" runs jobs on worker threads; "inline" runs each job inside the
+# request that submits it. Job state lives only in this process, so platforms
+# without a long-lived process (serverless functions such as Vercel, which sets
+# VERCEL=1) must run inline: a background job could be lost when the instance
+# is recycled, and a poll could land on an instance that never saw the job.
+MATCHING_MODE = os.getenv("MATCHING_MODE", "inline" if os.getenv("VERCEL") else "background")
+# Finished jobs kept around for status polling
+MAX_TRACKED_JOBS = int(os.getenv("MATCHING_MAX_TRACKED_JOBS", "10000"))
+# Lower value runs first; emergency intents jump ahead of regular ones
+EMERGENCY_PRIORITY = 0
+NORMAL_PRIORITY = 1
+PRIORITY_CLASSES = {EMERGENCY_PRIORITY: "emergency", NORMAL_PRIORITY: "normal"}
+# End-to-end (enqueue to result) latency target for emergency jobs
+EMERGENCY_LATENCY_TARGET_MS = float(os.getenv("EMERGENCY_LATENCY_TARGET_MS", "100"))
+# Recent jobs per priority class kept for latency percentiles
+LATENCY_WINDOW = 1000
+
+@dataclass
+class MatchingJob:
+    """A queued matching pass for one newly created barter edge"""
+    user_id: int
+    edge_id: int
+    priority: int = NORMAL_PRIORITY
+    job_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = "queued"  # queued, running, matched, no_match, failed
+    match_id: Optional[int] = None
+    result: Optional[Dict] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict:
+        data = {
+            "job_id": self.job_id,
+            "status": self.status,
+            "user_id": self.user_id,
+            "barter_intent_id": self.edge_id,
+            "priority": PRIORITY_CLASSES[self.priority],
+            "match_found": self.status == "matched",
+        }
+        if self.result:
+            data["match"] = {
+                "id": self.match_id,
+                "type": self.result["type"],
+                "participants": self.result["participants"],
+                "explanation": self.result.get("explanation"),
+                "flow": self.result.get("flow")
+            }
+        if self.error:
+            data["error"] = self.error
+        if self.finished_at:
+            data["latency_ms"] = round((self.finished_at - self.created_at) * 1000, 3)
+        return data
+
+class MatchingJobQueue:
+    """
+    In-process matching job queue. Requests enqueue a job and return at once;
+    a fixed pool of worker threads (bounded concurrency) runs the cycle search
+    with their own database sessions and records the resulting match.
+    Jobs are served by priority, so emergency intents never wait behind a
+    backlog of regular ones; equal priorities run in submission order.
+
+    Jobs are not persisted: they are tracked in memory and only this process
+    can report on them. In inline mode submit() runs the job before returning,
+    so the caller gets the finished job without polling.
+    """
+
+    def __init__(self, workers: int = MATCHING_WORKERS, max_tracked_jobs: int = MAX_TRACKED_JOBS,
+                 mode: str = MATCHING_MODE):
+        if mode not in ("background", "inline"):
+            raise ValueError(f"Unknown MATCHING_MODE '{mode}'")
+        self.mode = mode
+        self.workers = workers
+        self.max_tracked_jobs = max_tracked_jobs
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._latencies: Dict[int, deque] = {
+            priority: deque(maxlen=LATENCY_WINDOW) for priority in PRIORITY_CLASSES
+        }
+        self._jobs: "OrderedDict[str, MatchingJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+
+    def start(self):
+        """Start the worker threads (idempotent)"""
+        with self._lock:
+            if self._threads:
+                return
+            for n in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"matching-worker-{n}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, user_id: int, edge_id: int, emergency: bool = False) -> MatchingJob:
+        priority = EMERGENCY_PRIORITY if emergency else NORMAL_PRIORITY
+        job = MatchingJob(user_id=user_id, edge_id=edge_id, priority=priority)
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._trim()
+        if self.mode == "inline":
+            self._run(job)
+            return job
+        self.start()
+        self._queue.put((priority, next(self._sequence), job))
+        return job
+
+    def get(self, job_id: str) -> Optional[MatchingJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            latency = {
+                PRIORITY_CLASSES[priority]: _latency_summary(list(samples))
+                for priority, samples in self._latencies.items()
+            }
+        emergency = latency["emergency"]
+        if emergency["count"]:
+            emergency["target_ms"] = EMERGENCY_LATENCY_TARGET_MS
+            emergency["within_target"] = round(
+                sum(1 for total, _ in self._latencies[EMERGENCY_PRIORITY] if total <= EMERGENCY_LATENCY_TARGET_MS)
+                / emergency["count"], 4
+            )
+        return {"mode": self.mode, "workers": self.workers, "queue_depth": self._queue.qsize(), "jobs": counts, "latency": latency}
+
+    def _trim(self):
+        # Forget the oldest finished jobs once over the tracking limit
+        excess = len(self._jobs) - self.max_tracked_jobs
+        for job_id in [j.job_id for j in self._jobs.values() if j.finished_at][:max(0, excess)]:
+            del self._jobs[job_id]
+
+    def _work(self):
+        while True:
+            _, _, job = self._queue.get()
+            try:
+                self._run(job)
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job: MatchingJob):
+        job.status = "running"
+        job.started_at = time.time()
+        db = SessionLocal()
+        try:
+            match_result = run_matching(db, job.user_id, edge_id=job.edge_id)
+            if match_result:
+                match = crud.create_match(
+                    db=db,
+                    user_id=job.user_id,
+                    match_type=match_result["type"],
+                    participants=match_result["participants"]
+                )
+                job.match_id = match.id
+                job.result = match_result
+                job.status = "matched"
+            else:
+                job.status = "no_match"
+        except Exception as e:
+            db.rollback()
+            job.error = str(e)
+            job.status = "failed"
+            logger.exception("Matching job %s failed", job.job_id)
+        finally:
+            db.close()
+            job.finished_at = time.time()
+            with self._lock:
+                self._latencies[job.priority].append((
+                    (job.finished_at - job.created_at) * 1000,
+                    (job.started_at - job.created_at) * 1000
+                ))
+
+def _latency_summary(samples) -> Dict:
+    """Percentiles of (total, queue wait) latency samples in milliseconds"""
+    if not samples:
+        return {"count": 0}
+    totals = sorted(total for total, _ in samples)
+    waits = sorted(wait for _, wait in samples)
+
+    def pick(ordered, p):
+        return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))], 3)
+
+    return {
+        "count": len(totals),
+        "p50_ms": pick(totals, 50),
+        "p95_ms": pick(totals, 95),
+        "p99_ms": pick(totals, 99),
+        "max_ms": round(totals[-1], 3),
+        "queue_wait_p50_ms": pick(waits, 50),
+        "queue_wait_p95_ms": pick(waits, 95)
+    }
+
+# Singleton instance
+_matching_queue = None
+
+def get_matching_queue() -> MatchingJobQueue:
+    """Get or create singleton matching job queue"""
+    global _matching_queue
+    if _matching_queue is None:
+        _matching_queue = MatchingJobQueue()
+    return _matching_queue
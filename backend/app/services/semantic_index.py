@@ -0,0 +1,194 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+import math
+import os
+import re
+import threading
+import zlib
+import numpy as np
+
+# Hashed feature space size and character n-gram lengths
+VECTOR_DIM = int(os.getenv("SEMANTIC_VECTOR_DIM", "4096"))
+NGRAM_SIZES = (3, 4)
+# Share of the encoding given to lexicon concepts when a text has any, so two
+# phrases of the same concept score at least this much regardless of spelling
+CONCEPT_SHARE = 0.75
+
+# Small campus lexicon: every phrase in a group names the same thing, so any
+# one of them satisfies a want for another. Groups hold synonyms only, never
+# broader families (a laptop is electronics, but wanting a laptop is not
+# wanting a mouse): concept overlap alone clears MATCH_THRESHOLD.
+CONCEPT_GROUPS = {
+    "notes": ["notes", "study material", "study notes", "class notes", "handwritten notes"],
+    "textbook": ["textbook", "textbooks", "book", "books", "reference book", "reference books"],
+    "question_papers": ["question papers", "previous year papers", "past papers", "pyq"],
+    "notebook": ["notebook", "notebooks", "register", "registers"],
+    "lab_coat": ["lab coat", "apron", "lab apron"],
+    "goggles": ["goggles", "safety glasses", "safety goggles"],
+    "drafter": ["drafter", "mini drafter", "drafting machine"],
+    "drawing_instruments": ["drawing instruments", "drafting tools", "drawing kit", "geometry box"],
+    "calculator": ["calculator", "scientific calculator", "calc"],
+    "earphones": ["earphones", "earbuds", "in ear headphones"],
+    "power_bank": ["power bank", "portable charger"],
+    "cycle": ["bicycle", "cycle", "bike"],
+    "lamp": ["study lamp", "table lamp", "desk lamp"],
+    "utensils": ["kitchenware", "utensils", "cookware"],
+    "kettle": ["kettle", "electric kettle"],
+    "bottle": ["bottle", "water bottle", "sipper"],
+    "hoodie": ["hoodie", "sweatshirt"],
+    "t_shirt": ["t-shirt", "tshirt", "tee"],
+    "dumbbells": ["dumbbells", "dumbbell", "weights"],
+}
+
+_CONCEPTS = sorted(CONCEPT_GROUPS)
+_PHRASES = {
+    tuple(re.sub(r"[^a-z0-9]+", " ", phrase).split()): _CONCEPTS.index(concept)
+    for concept, phrases in CONCEPT_GROUPS.items() for phrase in phrases
+}
+_LONGEST_PHRASE = max(len(phrase) for phrase in _PHRASES)
+
+def _normalize(text: str) -> List[str]:
+    return re.sub(r"[^a-z0-9]+", " ", (text or "").lower()).split()
+
+class HashedNgramEncoder:
+    """
+    Offline text encoder. The surface part is TF-IDF over hashed words and
+    character n-grams; the concept part marks lexicon concepts found in the
+    text. Both parts are L2-normalized and concatenated with fixed shares, so
+    the dot product of two encodings is a similarity in [0, 1] (1 for equal
+    texts). IDF comes from a fixed reference corpus, which keeps encodings,
+    and therefore match decisions, stable as the market changes.
+    """
+
+    def __init__(self, dim: int = VECTOR_DIM, reference: Optional[Iterable[str]] = None):
+        self.dim = dim
+        self.size = dim + len(_CONCEPTS)
+        reference = list(reference if reference is not None else
+                         [" ".join(phrase) for phrase in _PHRASES])
+        document_frequency = np.zeros(dim, dtype=np.float64)
+        for text in reference:
+            document_frequency[list(self.surface_features(_normalize(text)))] += 1
+        # Smoothed IDF; features never seen in the reference get the maximum weight
+        self.idf = np.log((1 + len(reference)) / (1 + document_frequency)) + 1.0
+
+    def _bucket(self, token: str) -> int:
+        # crc32 is stable across processes, unlike hash()
+        return zlib.crc32(token.encode()) % self.dim
+
+    def surface_features(self, words: List[str]) -> Dict[int, float]:
+        """Hashed word and character n-gram bucket -> sublinear term frequency"""
+        counts: Dict[int, int] = {}
+        for word in words:
+            tokens = [f"w:{word}"]
+            padded = f"<{word}>"
+            for n in NGRAM_SIZES:
+                tokens.extend(f"g:{padded[i:i + n]}" for i in range(len(padded) - n + 1))
+            for token in tokens:
+                bucket = self._bucket(token)
+                counts[bucket] = counts.get(bucket, 0) + 1
+        return {bucket: 1.0 + math.log(count) for bucket, count in counts.items()}
+
+    def concepts(self, words: List[str]) -> Dict[int, int]:
+        """Lexicon concept index -> number of phrases of that concept in the text"""
+        found: Dict[int, int] = {}
+        for size in range(1, _LONGEST_PHRASE + 1):
+            for i in range(len(words) - size + 1):
+                concept = _PHRASES.get(tuple(words[i:i + size]))
+                if concept is not None:
+                    found[concept] = found.get(concept, 0) + 1
+        return found
+
+    def encode(self, text: str) -> np.ndarray:
+        words = _normalize(text)
+        vector = np.zeros(self.size, dtype=np.float32)
+        for bucket, weight in self.surface_features(words).items():
+            vector[bucket] = weight * self.idf[bucket]
+        surface_norm = np.linalg.norm(vector[:self.dim])
+        if surface_norm:
+            vector[:self.dim] /= surface_norm
+
+        concepts = self.concepts(words)
+        if concepts:
+            for concept, count in concepts.items():
+                vector[self.dim + concept] = count
+            vector[self.dim:] *= math.sqrt(CONCEPT_SHARE) / np.linalg.norm(vector[self.dim:])
+            vector[:self.dim] *= math.sqrt(1.0 - CONCEPT_SHARE)
+        return vector
+
+    def similarity(self, a: str, b: str) -> float:
+        return float(np.clip(self.encode(a) @ self.encode(b), 0.0, 1.0))
+
+class VectorIndex:
+    """
+    NumPy-backed nearest-neighbour index over short texts (categories).
+    Rows live in a growable float32 matrix; a query is one matrix-vector
+    product followed by a partial sort for the top k.
+    """
+
+    def __init__(self, encoder: "HashedNgramEncoder"):
+        self.encoder = encoder
+        self._lock = threading.RLock()
+        self.keys: List[str] = []
+        self.positions: Dict[str, int] = {}
+        self.matrix = np.zeros((16, encoder.size), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.positions
+
+    def add(self, key: str, text: Optional[str] = None):
+        with self._lock:
+            if key in self.positions:
+                return
+            if len(self.keys) == self.matrix.shape[0]:
+                grown = np.zeros((self.matrix.shape[0] * 2, self.encoder.size), dtype=np.float32)
+                grown[:len(self.keys)] = self.matrix[:len(self.keys)]
+                self.matrix = grown
+            self.positions[key] = len(self.keys)
+            self.matrix[len(self.keys)] = self.encoder.encode(text if text is not None else key)
+            self.keys.append(key)
+
+    def remove(self, key: str):
+        """Remove a key by moving the last row into its slot"""
+        with self._lock:
+            position = self.positions.pop(key, None)
+            if position is None:
+                return
+            last = len(self.keys) - 1
+            if position != last:
+                moved = self.keys[last]
+                self.keys[position] = moved
+                self.matrix[position] = self.matrix[last]
+                self.positions[moved] = position
+            self.keys.pop()
+
+    def query(self, text: str, k: Optional[int] = None, min_score: float = 0.0) -> List[Tuple[str, float]]:
+        """
+        Keys most similar to text, best first: the top k (all when k is None)
+        with similarity >= min_score
+        """
+        with self._lock:
+            count = len(self.keys)
+            if not count:
+                return []
+            scores = self.matrix[:count] @ self.encoder.encode(text)
+            candidates = np.flatnonzero(scores >= min_score)
+            if k is not None and len(candidates) > k:
+                candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+            ordered = candidates[np.argsort(-scores[candidates], kind="stable")]
+            return [(self.keys[i], float(min(scores[i], 1.0))) for i in ordered]
+
+# Singleton instance
+_encoder = None
+
+def get_semantic_encoder() -> HashedNgramEncoder:
+    """Get or create singleton semantic encoder"""
+    global _encoder
+    if _encoder is None:
+        _encoder = HashedNgramEncoder()
+    return _encoder
+
+def semantic_similarity(a: str, b: str) -> float:
+    """Semantic similarity of two category strings in [0, 1]"""
+    return get_semantic_encoder().similarity(a, b)
@@ -0,0 +1,88 @@
+from collections import OrderedDict
+from difflib import SequenceMatcher
+from app.services.semantic_index import semantic_similarity
+from typing import Dict
+import os
+import threading
+
+# Minimum similarity for an item category to satisfy a wanted category
+MATCH_THRESHOLD = 0.7
+# Similarity backend: "sequence" (character ratio) or "semantic" (local vector encoder)
+CATEGORY_MATCHER = os.getenv("CATEGORY_MATCHER", "sequence")
+
+def similarity_score(a: str, b: str) -> float:
+    """Calculate similarity between two strings using SequenceMatcher"""
+    return SequenceMatcher(None, a.lower(), b.lower()).ratio()
+
+class CategorySimilarityTable:
+    """
+    Bounded, LRU-evicted memo of category similarity ratios.
+    Keys are (item category, want category) pairs after lowercasing, so the
+    few distinct campus categories are compared once instead of per edge pair.
+    Both matchers return a ratio in [0, 1] compared against MATCH_THRESHOLD.
+    """
+
+    def __init__(self, max_size: int = 10000, matcher: str = "sequence"):
+        if matcher not in ("sequence", "semantic"):
+            raise ValueError(f"Unknown category matcher: {matcher}")
+        self.max_size = max_size
+        self.matcher = matcher
+        self._scorer = semantic_similarity if matcher == "semantic" else similarity_score
+        self._table: "OrderedDict[tuple, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def score(self, item_category: str, want_category: str) -> float:
+        """Similarity of an item category to a wanted category (order matters)"""
+        key = (item_category.lower(), want_category.lower())
+        with self._lock:
+            ratio = self._table.get(key)
+            if ratio is not None:
+                self._table.move_to_end(key)
+                self.hits += 1
+                return ratio
+            self.misses += 1
+
+        ratio = self._scorer(*key)
+
+        with self._lock:
+            self._table[key] = ratio
+            self._table.move_to_end(key)
+            while len(self._table) > self.max_size:
+                self._table.popitem(last=False)
+                self.evictions += 1
+        return ratio
+
+    def clear(self):
+        with self._lock:
+            self._table.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict:
+        """Cache size and hit-rate counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "matcher": self.matcher,
+                "size": len(self._table),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+# Singleton instance
+_similarity_table = None
+
+def get_similarity_table() -> CategorySimilarityTable:
+    """Get or create singleton category similarity table"""
+    global _similarity_table
+    if _similarity_table is None:
+        _similarity_table = CategorySimilarityTable(
+            max_size=int(os.getenv("SIMILARITY_CACHE_SIZE", "10000")),
+            matcher=CATEGORY_MATCHER
+        )
+    return _similarity_table
@@ -0,0 +1,91 @@
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import os
+import threading
+import time
+
+class UserStatsCache:
+    """
+    LRU cache of per-user dashboard stats. crud drops a user's entry whenever
+    that user's items, matches or credits change, but only in its own process:
+    writes made by another worker process or straight to the database are not
+    seen here, so entries also expire after ttl seconds to bound how stale such
+    a hit can be. Readers pass the generation they saw before querying to
+    put(), so a result computed while a write was landing is never cached.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 30.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        # user_id -> (expires_at, stats)
+        self._entries: "OrderedDict[int, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.expirations = 0
+        self.generation = 0
+
+    def get(self, user_id: int) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[user_id]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return dict(entry[1])
+
+    def put(self, user_id: int, stats: Dict, generation: Optional[int] = None):
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[user_id] = (time.monotonic() + self.ttl, dict(stats))
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *user_ids: int):
+        with self._lock:
+            self.generation += 1
+            for user_id in user_ids:
+                if self._entries.pop(user_id, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+            self.hits = self.misses = self.invalidations = self.expirations = 0
+
+    def stats(self) -> Dict:
+        """Cache size and hit-rate counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+# Singleton instance
+_stats_cache = None
+
+def get_stats_cache() -> UserStatsCache:
+    """Get or create singleton user stats cache"""
+    global _stats_cache
+    if _stats_cache is None:
+        _stats_cache = UserStatsCache(
+            max_size=int(os.getenv("USER_STATS_CACHE_SIZE", "10000")),
+            ttl=float(os.getenv("USER_STATS_CACHE_TTL", "30"))
+        )
+    return _stats_cache
@@ -0,0 +1,68 @@
+from typing import Dict, Iterable, List, Sequence, Tuple
+import numpy as np
+
+class ScoringArrays:
+    """
+    Integer-encoded participant attributes for vectorized match scoring.
+    Department and hostel strings become category codes, so scoring many
+    candidate pairs or cycles is a handful of array comparisons that give the
+    same results as calculate_match_score / calculate_cycle_score.
+    """
+
+    def __init__(self, edges: Iterable):
+        edges = list(edges)
+        departments: Dict[str, int] = {}
+        hostels: Dict[str, int] = {}
+        edge_ids = np.array([edge.edge_id for edge in edges], dtype=np.int64)
+        # Dense edge id -> array position lookup
+        self.lookup = np.full(int(edge_ids.max()) + 1 if len(edges) else 1, -1, dtype=np.int64)
+        self.lookup[edge_ids] = np.arange(len(edges))
+        self.department = np.array(
+            [departments.setdefault(edge.user.department, len(departments)) for edge in edges], dtype=np.int32
+        )
+        self.hostel = np.array(
+            [hostels.setdefault(edge.user.hostel, len(hostels)) for edge in edges], dtype=np.int32
+        )
+        self.semester = np.array([edge.user.semester for edge in edges], dtype=np.int32)
+        self.emergency = np.array([bool(edge.emergency) for edge in edges], dtype=bool)
+
+    def positions_of(self, edge_ids: Sequence) -> np.ndarray:
+        """Array positions for edge ids (any shape)"""
+        return self.lookup[np.asarray(edge_ids, dtype=np.int64)]
+
+    def pair_scores(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Vectorized calculate_match_score for edge positions a[i] and b[i]"""
+        emergency = (self.emergency[a] | self.emergency[b]).astype(np.int32)
+        score = 2 * (self.department[a] == self.department[b])
+        score += np.abs(self.semester[a] - self.semester[b]) <= 1
+        # Hostel bonus is 3 for emergency swaps, otherwise 1
+        score += (self.hostel[a] == self.hostel[b]) * (1 + 2 * emergency)
+        score += 5 * emergency
+        return score.astype(np.float64)
+
+    def cycle_scores(self, cycles: List[Tuple[int, ...]]) -> np.ndarray:
+        """
+        Vectorized calculate_cycle_score for cycles given as edge id tuples,
+        or as an (n_cycles, length) array of edge ids of one length
+        """
+        if isinstance(cycles, np.ndarray):
+            return self._uniform_cycle_scores(self.positions_of(cycles))
+
+        scores = np.zeros(len(cycles), dtype=np.float64)
+        by_length: Dict[int, List[int]] = {}
+        for i, cycle in enumerate(cycles):
+            by_length.setdefault(len(cycle), []).append(i)
+
+        for length, members in by_length.items():
+            scores[members] = self._uniform_cycle_scores(self.positions_of([cycles[i] for i in members]))
+        return scores
+
+    def _uniform_cycle_scores(self, matrix: np.ndarray) -> np.ndarray:
+        """Scores for an (n_cycles, length) matrix of edge positions"""
+        length = matrix.shape[1]
+        if length == 2:
+            return self.pair_scores(matrix[:, 0], matrix[:, 1])
+        # Average over every hand-off to the next participant
+        following = np.roll(matrix, -1, axis=1)
+        hand_offs = self.pair_scores(matrix.ravel(), following.ravel()).reshape(matrix.shape)
+        return hand_offs.sum(axis=1) / length
@@ -0,0 +1,245 @@
+"""
+Matching engine benchmark suite.
+
+Generates synthetic campuses into throwaway SQLite databases and reports
+latency percentiles and query counts for the matching entry points, as JSON.
+
+    python benchmark_matching.py --sizes 100 1000 10000 --output bench.json
+"""
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app import models
+from app.services import matching_engine
+from app.services.barter_index import get_barter_index
+from app.services.cycle_detection import run_cycle_sweep
+from app.services.cycle_signatures import get_live_signatures
+from app.services.market_clearing import run_market_clearing
+from app.services.similarity import get_similarity_table
+from datetime import datetime
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BASE_CATEGORIES = [
+    "textbook", "lab coat", "drafting tools", "calculator", "lab equipment",
+    "notes", "stationery", "electronics", "bicycle", "sports gear",
+    "hostel furniture", "kitchenware", "clothing", "musical instrument", "laptop accessories"
+]
+QUALIFIERS = ["physics", "chemistry", "mechanical", "civil", "electrical", "biology", "math", "design"]
+
+def build_vocabulary(size: int):
+    """Category vocabulary: base categories plus department-qualified variants"""
+    vocabulary = list(BASE_CATEGORIES)
+    for qualifier in QUALIFIERS:
+        for category in BASE_CATEGORIES:
+            vocabulary.append(f"{qualifier} {category}")
+    return vocabulary[:size]
+
+def generate_campus(session_factory, n_edges: int, config, rng: random.Random):
+    """Bulk-insert users, items and active barter edges for one synthetic campus"""
+    vocabulary = build_vocabulary(config.categories)
+    # Zipf-like popularity: a few categories are wanted far more than the rest
+    want_weights = [1.0 / (rank + 1) ** config.want_skew for rank in range(len(vocabulary))]
+    hostels = [f"Block {chr(65 + i)}" for i in range(config.hostels)]
+    departments = ["Mechanical", "Computer Science", "Civil", "Electrical", "Chemical", "Biotech"]
+    n_users = max(2, int(n_edges / config.edges_per_user))
+
+    users = [
+        {
+            "id": i + 1,
+            "name": f"Student {i + 1}",
+            "email": f"student{i + 1}@campus.edu",
+            "semester": rng.randint(1, 8),
+            "department": rng.choice(departments),
+            "hostel": rng.choice(hostels)
+        }
+        for i in range(n_users)
+    ]
+    items, edges = [], []
+    for i in range(n_edges):
+        owner = rng.randint(1, n_users)
+        items.append({
+            "id": i + 1,
+            "owner_id": owner,
+            "name": f"Item {i + 1}",
+            "category": rng.choice(vocabulary),
+            "condition": "good",
+            "status": "available"
+        })
+        edges.append({
+            "id": i + 1,
+            "user_id": owner,
+            "item_id": i + 1,
+            "want_category": rng.choices(vocabulary, weights=want_weights)[0],
+            "emergency": rng.random() < config.emergency_ratio,
+            "active": True
+        })
+
+    db = session_factory()
+    try:
+        db.execute(insert(models.User), users)
+        db.execute(insert(models.Item), items)
+        db.execute(insert(models.BarterEdge), edges)
+        db.commit()
+    finally:
+        db.close()
+    return [user["id"] for user in users]
+
+def percentiles(samples_ms):
+    ordered = sorted(samples_ms)
+
+    def pick(p):
+        return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))], 3)
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "p50_ms": pick(50),
+        "p90_ms": pick(90),
+        "p99_ms": pick(99),
+        "max_ms": round(ordered[-1], 3)
+    }
+
+def time_calls(fn, db, user_ids, query_counter):
+    latencies, queries = [], []
+    for user_id in user_ids:
+        before = query_counter[0]
+        start = time.perf_counter()
+        fn(db, user_id)
+        latencies.append((time.perf_counter() - start) * 1000)
+        queries.append(query_counter[0] - before)
+    result = percentiles(latencies)
+    result["queries_mean"] = round(statistics.fmean(queries), 2)
+    result["queries_max"] = max(queries)
+    return result
+
+def benchmark_size(n_edges: int, config, rng: random.Random):
+    with tempfile.TemporaryDirectory(prefix="eco_sync_bench_") as workdir:
+        return _benchmark_in(workdir, n_edges, config, rng)
+
+def _benchmark_in(workdir: str, n_edges: int, config, rng: random.Random):
+    engine = create_engine(f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+                           connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    start = time.perf_counter()
+    user_ids = generate_campus(session_factory, n_edges, config, rng)
+    generate_ms = (time.perf_counter() - start) * 1000
+
+    query_counter = [0]
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_query(*args):
+        query_counter[0] += 1
+
+    db = session_factory()
+    try:
+        # Cold start: the first lookup loads the barter index in one query
+        get_barter_index().invalidate()
+        get_live_signatures().invalidate()
+        get_similarity_table().clear()
+        before = query_counter[0]
+        start = time.perf_counter()
+        get_barter_index(db)
+        index_load = {
+            "ms": round((time.perf_counter() - start) * 1000, 3),
+            "queries": query_counter[0] - before
+        }
+
+        sample = rng.sample(user_ids, min(config.samples, len(user_ids)))
+        functions = {
+            "find_direct_match": time_calls(matching_engine.find_direct_match, db, sample, query_counter),
+            "find_three_way_cycle": time_calls(matching_engine.find_three_way_cycle, db, sample, query_counter),
+            "run_matching": time_calls(matching_engine.run_matching, db, sample, query_counter)
+        }
+
+        # Emergency fast path: hostel-local search from emergency edges
+        index = get_barter_index(db)
+        emergency_edges = {edge.user_id: edge.edge_id for edge in index.edges.values() if edge.emergency}
+        if emergency_edges:
+            emergency_sample = rng.sample(sorted(emergency_edges), min(config.samples, len(emergency_edges)))
+            functions["find_emergency_match"] = time_calls(
+                lambda session, user_id: matching_engine.find_emergency_match(
+                    session, user_id, emergency_edges[user_id]
+                ),
+                db, emergency_sample, query_counter
+            )
+
+        result = {
+            "edges": n_edges,
+            "users": len(user_ids),
+            "generate_ms": round(generate_ms, 1),
+            "index_load": index_load,
+            "functions": functions,
+            "similarity_cache": get_similarity_table().stats()
+        }
+        sweep = run_cycle_sweep(db, extract=False)
+        sweep.pop("stranded_user_ids")
+        result["cycle_sweep"] = sweep
+        if n_edges <= config.clearing_max_edges:
+            report = run_market_clearing(db)
+            report.pop("match_ids")
+            result["market_clearing"] = report
+        return result
+    finally:
+        db.close()
+        engine.dispose()
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Eco-Sync matching engine")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000],
+                        help="numbers of active barter edges to benchmark")
+    parser.add_argument("--categories", type=int, default=60, help="category vocabulary size")
+    parser.add_argument("--want-skew", type=float, default=1.0, help="Zipf exponent of the want distribution")
+    parser.add_argument("--emergency-ratio", type=float, default=0.1)
+    parser.add_argument("--hostels", type=int, default=8)
+    parser.add_argument("--edges-per-user", type=float, default=2.0)
+    parser.add_argument("--samples", type=int, default=200, help="users timed per function and size")
+    parser.add_argument("--clearing-max-edges", type=int, default=10000,
+                        help="also time market clearing up to this many edges")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write JSON results to this file (default: stdout)")
+    config = parser.parse_args()
+
+    rng = random.Random(config.seed)
+    results = []
+    for n_edges in config.sizes:
+        print(f"⏱️ Benchmarking {n_edges} edges...", file=sys.stderr, flush=True)
+        results.append(benchmark_size(n_edges, config, rng))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": vars(config)
+        },
+        "results": results
+    }
+    output = json.dumps(report, indent=2)
+    if config.output:
+        with open(config.output, "w") as f:
+            f.write(output)
+        print(f"✅ Results written to {config.output}", file=sys.stderr)
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
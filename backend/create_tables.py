@@ -1,10 +1,12 @@
 from app.database import engine, Base
 from app import models
+from app.migrations import run_migrations
 
 def create_tables():
     """Create all database tables"""
     print("Creating database tables...")
     Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
     print("✅ Database tables created successfully!")
 
 if __name__ == "__main__":
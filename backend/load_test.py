@@ -0,0 +1,127 @@
+"""
+Mixed-traffic load test against a running API server.
+
+Concurrent clients send photo uploads (POST /items/users/{id}/items/upload-photo)
+interleaved with reads (user stats, item lists, single items) and report
+requests/sec and per-endpoint latency percentiles as JSON. Run it against a
+server before and after a change to compare.
+
+    python uvicorn_run.py  # in another terminal
+    python load_test.py --base-url http://localhost:8000/api/v1 --clients 32 --duration 20
+"""
+from benchmark_matching import git_revision, percentiles
+from datetime import datetime
+from PIL import Image
+import argparse
+import asyncio
+import httpx
+import io
+import json
+import platform
+import random
+import time
+
+def make_photo() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 64), (34, 139, 34)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+async def setup_users(client: httpx.AsyncClient, count: int, run_id: str):
+    """Register load-test users, each with one item to read back"""
+    user_ids, item_ids = [], []
+    for i in range(count):
+        res = await client.post("/users/", json={
+            "name": f"Load {i}", "email": f"load{i}.{run_id}@campus.edu",
+            "semester": 1 + i % 8, "department": "Mechanical", "hostel": "Block A"
+        })
+        res.raise_for_status()
+        user_id = res.json()["id"]
+        res = await client.post(f"/items/users/{user_id}/items", json={
+            "name": f"Load item {i}", "category": "textbook", "condition": "good"
+        })
+        res.raise_for_status()
+        user_ids.append(user_id)
+        item_ids.append(res.json()["id"])
+    return user_ids, item_ids
+
+async def client_loop(client, deadline, config, user_ids, item_ids, photo, samples, errors, rng):
+    while time.perf_counter() < deadline:
+        user_id = rng.choice(user_ids)
+        if rng.random() < config.upload_ratio:
+            kind = "upload_photo"
+            request = client.post(f"/items/users/{user_id}/items/upload-photo",
+                                  files={"file": ("load.png", photo, "image/png")})
+        else:
+            kind, path = rng.choice([
+                ("user_stats", f"/users/{user_id}/stats"),
+                ("user_items", f"/items/users/{user_id}/items"),
+                ("item", f"/items/{rng.choice(item_ids)}"),
+            ])
+            request = client.get(path)
+        start = time.perf_counter()
+        try:
+            res = await request
+            ok = res.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        if ok:
+            samples.setdefault(kind, []).append((time.perf_counter() - start) * 1000)
+        else:
+            errors[kind] = errors.get(kind, 0) + 1
+
+async def run(config):
+    limits = httpx.Limits(max_connections=config.clients)
+    async with httpx.AsyncClient(base_url=config.base_url, timeout=60, limits=limits) as client:
+        user_ids, item_ids = await setup_users(client, config.users, datetime.utcnow().strftime("%Y%m%d%H%M%S%f"))
+        photo = make_photo()
+        samples, errors = {}, {}
+        start = time.perf_counter()
+        deadline = start + config.duration
+        await asyncio.gather(*(
+            client_loop(client, deadline, config, user_ids, item_ids, photo, samples, errors,
+                        random.Random(config.seed + i))
+            for i in range(config.clients)
+        ))
+        elapsed = time.perf_counter() - start
+
+    completed = sum(len(latencies) for latencies in samples.values())
+    return {
+        "requests": completed,
+        "errors": errors,
+        "duration_s": round(elapsed, 2),
+        "requests_per_s": round(completed / elapsed, 1),
+        "endpoints": {kind: percentiles(latencies) for kind, latencies in sorted(samples.items())}
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Mixed upload/read load test for the Eco-Sync API")
+    parser.add_argument("--base-url", default="http://localhost:8000/api/v1")
+    parser.add_argument("--clients", type=int, default=32, help="concurrent clients")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of load")
+    parser.add_argument("--upload-ratio", type=float, default=0.2, help="share of requests that upload a photo")
+    parser.add_argument("--users", type=int, default=50, help="users created for the test")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write JSON results to this file (default: stdout)")
+    config = parser.parse_args()
+
+    print(f"⏱️ {config.clients} clients for {config.duration}s against {config.base_url}...", flush=True)
+    report = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": vars(config)
+        },
+        "result": asyncio.run(run(config))
+    }
+    output = json.dumps(report, indent=2)
+    if config.output:
+        with open(config.output, "w") as f:
+            f.write(output)
+        print(f"✅ Results written to {config.output}")
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
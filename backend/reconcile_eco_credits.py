@@ -0,0 +1,47 @@
+"""
+Verify maintained eco-credit balances against the raw ledger.
+
+    python reconcile_eco_credits.py            # rows since each user's last snapshot
+    python reconcile_eco_credits.py --full     # re-sum the whole ledger
+    python reconcile_eco_credits.py --fix      # reset mismatched balances to the ledger
+    python reconcile_eco_credits.py --snapshot # record a new snapshot afterwards
+
+A running server keeps its own in-memory leaderboard and stats cache, which a
+--fix from this script cannot reach: restart the server afterwards, or fix
+through POST /api/v1/admin/eco-credits/reconcile?fix=true instead.
+"""
+from app.database import SessionLocal, engine, Base
+from app.migrations import run_migrations
+from app import crud
+import argparse
+import sys
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Reconcile eco-credit balances with the ledger")
+    parser.add_argument("--full", action="store_true", help="re-sum the whole ledger instead of since the last snapshot")
+    parser.add_argument("--fix", action="store_true", help="reset mismatched balances to the ledger value")
+    parser.add_argument("--snapshot", action="store_true", help="record a ledger snapshot after a clean check")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    db = SessionLocal()
+    try:
+        report = crud.reconcile_eco_credits(db, full=args.full, fix=args.fix)
+        print(f"🔎 Checked {report['users_checked']} balances ({report['mode']})")
+        for mismatch in report["mismatches"]:
+            print(f"❌ User {mismatch['user_id']}: balance {mismatch['balance']}, ledger {mismatch['ledger']}")
+        if report["fixed"]:
+            print(f"🔧 Fixed {report['fixed']} balances (restart a running server to refresh its leaderboard)")
+        elif not report["mismatches"]:
+            print("✅ All balances match the ledger")
+
+        clean = not report["mismatches"] or report["fixed"]
+        if args.snapshot and clean:
+            print(f"📸 Recorded {crud.create_eco_credit_snapshots(db)} snapshots")
+        return 0 if clean else 1
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -28,7 +28,7 @@ def seed():
         elif res.status_code == 400:
             print("⚠️ Exists, fetching...", end=" ")
             # Fallback: find user
-            all_u = requests.get(f"{BASE_URL}/users/").json()
+            all_u = requests.get(f"{BASE_URL}/users/", params={"email": u['email']}).json()["items"]
             found = next((x for x in all_u if x['email'] == u['email']), None)
             if found:
                 ids[u['email']] = found['id']
@@ -43,7 +43,7 @@ def seed():
     if 'alice@corp.com' in ids:
         uid = ids['alice@corp.com']
         # Check if already has items
-        items = requests.get(f"{BASE_URL}/items/users/{uid}/items").json()
+        items = requests.get(f"{BASE_URL}/items/users/{uid}/items").json()["items"]
         if not items:
             item_data = {
                 "name": "Enterprise Server Rack",
@@ -60,7 +60,7 @@ def seed():
     # Bob has 'Forklift Battery'
     if 'bob@tech.com' in ids:
         uid = ids['bob@tech.com']
-        items = requests.get(f"{BASE_URL}/items/users/{uid}/items").json()
+        items = requests.get(f"{BASE_URL}/items/users/{uid}/items").json()["items"]
         if not items:
             item_data = {
                 "name": "Industrial Forklift Battery",
@@ -0,0 +1,74 @@
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app import crud, models
+from app.database import Base
+
+def make_session():
+    """In-memory database with one pending 3-way match between users 1, 2 and 3"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+    for i in range(1, 4):
+        db.add(models.User(id=i, name=f"User {i}", email=f"user{i}@campus.edu", semester=3,
+                           department="Mechanical", hostel="Block A"))
+        db.add(models.Item(id=i, owner_id=i, name=f"Item {i}", category="books", condition="good"))
+        db.add(models.BarterEdge(id=i, user_id=i, item_id=i, want_category="books"))
+    db.add(models.Match(id=1, user_id=1, type="three_way", participants="[]", status="pending", members=[
+        models.MatchParticipant(position=i - 1, user_id=i, item_id=i, wants="books") for i in range(1, 4)
+    ]))
+    db.commit()
+    return db
+
+def count_commits(db):
+    commits = []
+    event.listen(db, "after_commit", lambda session: commits.append(session))
+    return commits
+
+def test_final_acceptance_awards_once_in_one_commit():
+    db = make_session()
+    crud.accept_match(db, 1, 1)
+    crud.accept_match(db, 1, 2)
+    commits = count_commits(db)
+    crud.accept_match(db, 1, 3)
+    assert len(commits) == 1
+    # A second final acceptance (e.g. a retried request) must not award again
+    crud.accept_match(db, 1, 3)
+
+    assert crud.get_match(db, 1).status == "completed"
+    for user_id in range(1, 4):
+        credits = db.query(models.EcoCredit).filter(models.EcoCredit.user_id == user_id).all()
+        assert [credit.amount for credit in credits] == [10]
+        assert crud.get_user_total_eco_credits(db, user_id) == 10
+    assert {item.status for item in db.query(models.Item).all()} == {"swapped"}
+    assert not db.query(models.BarterEdge).filter(models.BarterEdge.active == True).count()
+
+def test_failed_completion_writes_nothing():
+    db = make_session()
+    crud.accept_match(db, 1, 1)
+    crud.accept_match(db, 1, 2)
+
+    def fail(db, amounts):
+        raise RuntimeError("balance update failed")
+
+    increment = crud._increment_eco_credit_totals
+    crud._increment_eco_credit_totals = fail
+    try:
+        crud.accept_match(db, 1, 3)
+        assert False, "accept_match should have raised"
+    except RuntimeError:
+        db.rollback()
+    finally:
+        crud._increment_eco_credit_totals = increment
+
+    assert crud.get_match(db, 1).status == "pending"
+    assert db.query(models.EcoCredit).count() == 0
+    assert db.query(models.EcoCreditTotal).count() == 0
+    assert {item.status for item in db.query(models.Item).all()} == {"available"}
+    waiting = db.query(models.MatchParticipant).filter(models.MatchParticipant.accepted == False).all()
+    assert [member.user_id for member in waiting] == [3]
+
+if __name__ == "__main__":
+    test_final_acceptance_awards_once_in_one_commit()
+    test_failed_completion_writes_nothing()
+    print("✅ accept_match completes in one commit, awards once and rolls back cleanly")
@@ -0,0 +1,65 @@
+import io
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app import models
+from app.database import Base
+from app.services.bulk_import import import_records
+
+USERS_CSV = """name,email,semester,department,hostel
+Arun,arun@campus.edu,5,Mechanical,Hostel A
+Priya,priya@campus.edu,5,Mechanical,Hostel B
+Arun Again,arun@campus.edu,5,Mechanical,Hostel A
+Broken,not-an-email,12,Mechanical,Hostel C
+"""
+
+ITEMS_JSONL = """{"owner_email": "arun@campus.edu", "name": "Drafter", "category": "drafter", "condition": "good"}
+{"owner_email": "priya@CAMPUS.edu", "name": "Calculator", "category": "calculator", "condition": "like_new"}
+{"owner_email": "ghost@campus.edu", "name": "Kettle", "category": "kettle", "condition": "good"}
+not json
+"""
+
+INTENTS_CSV = """owner_email,item_name,item_id,want_category,emergency
+arun@campus.edu,Drafter,,calculator,true
+priya@campus.edu,Calculator,,drafter,
+priya@campus.edu,Drafter,,textbook,
+arun@campus.edu,,,textbook,
+"""
+
+def make_session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+def run(db, kind, text, fmt):
+    return import_records(db, kind, io.StringIO(text), fmt, chunk_size=2)
+
+def test_import_reports_bad_rows_and_keeps_the_rest():
+    db = make_session()
+    users = run(db, "users", USERS_CSV, "csv")
+    assert (users["imported"], users["failed"]) == (2, 2)
+    assert sorted(error["line"] for error in users["errors"]) == [4, 5]
+
+    items = run(db, "items", ITEMS_JSONL, "jsonl")
+    assert (items["imported"], items["failed"]) == (2, 2)
+    assert sorted(error["line"] for error in items["errors"]) == [3, 4]
+
+    intents = run(db, "barter_intents", INTENTS_CSV, "csv")
+    # Priya does not own the Drafter, and the last row names no item
+    assert (intents["imported"], intents["failed"]) == (2, 2)
+
+    edges = {edge.user.name: edge for edge in db.query(models.BarterEdge).all()}
+    assert edges["Arun"].item.name == "Drafter" and edges["Arun"].emergency
+    assert edges["Priya"].item.name == "Calculator" and not edges["Priya"].emergency
+
+def test_reimport_is_rejected_row_by_row():
+    db = make_session()
+    run(db, "users", USERS_CSV, "csv")
+    again = run(db, "users", USERS_CSV, "csv")
+    assert again["imported"] == 0
+    assert db.query(models.User).count() == 2
+
+if __name__ == "__main__":
+    test_import_reports_bad_rows_and_keeps_the_rest()
+    test_reimport_is_rejected_row_by_row()
+    print("✅ Bulk import validates, resolves owners and items, and skips bad rows")
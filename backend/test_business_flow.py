@@ -30,7 +30,7 @@ def run_test():
                 print(f"✅ Created/Found User ID: {data['id']}")
             else:
                 # If 400 (likely email exists), fetch list
-                all_users = requests.get(f"{BASE_URL}/users/").json()
+                all_users = requests.get(f"{BASE_URL}/users/", params={"email": u['email']}).json()["items"]
                 found = next((x for x in all_users if x['email'] == u['email']), None)
                 if found:
                     user_ids[u['email']] = found['id']
@@ -79,9 +79,16 @@ def run_test():
     res = requests.post(f"{BASE_URL}/barter/barter-intents?user_id={alice_id}", json=intent_payload)
     if res.status_code == 200:
         data = res.json()
-        print(f"✅ Intent Created! Match Found? {data.get('match_found')}")
-        if data.get('match_found'):
-            print(f"   🎉 MATCH DETAILS: {data['match']}")
+        print(f"✅ Intent Created! Matching job: {data.get('job_id')}")
+        # Matching runs in the background; poll the job until it finishes
+        for _ in range(10):
+            job = requests.get(f"{BASE_URL}/barter/matching-jobs/{data['job_id']}").json()
+            if job['status'] not in ("queued", "running"):
+                break
+            time.sleep(0.5)
+        print(f"   Match Found? {job.get('match_found')}")
+        if job.get('match_found'):
+            print(f"   🎉 MATCH DETAILS: {job['match']}")
     else:
         print(f"❌ Barter Intent Failed: {res.text}")
 
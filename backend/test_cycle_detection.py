@@ -0,0 +1,67 @@
+import random
+from app import models
+from app.services.barter_index import BarterIndex
+from app.services.cycle_detection import detect_cycle_participation, run_cycle_sweep
+from app.services.matching_engine import item_matches_want
+from app.services.similarity import MATCH_THRESHOLD
+
+CATEGORIES = ["book", "books", "lab coat", "lab coats", "pen", "pens", "bike", "drafter"]
+
+def make_index(n_users: int, n_edges: int, seed: int) -> BarterIndex:
+    """Small random market where users often hold several edges"""
+    rng = random.Random(seed)
+    users = [
+        models.User(id=i, name=f"User {i}", email=f"user{i}@campus.edu", semester=1,
+                    department="Mechanical", hostel="Block A")
+        for i in range(1, n_users + 1)
+    ]
+    edges = []
+    for i in range(1, n_edges + 1):
+        user = rng.choice(users)
+        item = models.Item(id=i, owner_id=user.id, name=f"Item {i}", category=rng.choice(CATEGORIES),
+                           condition="good")
+        edges.append(models.BarterEdge(id=i, user_id=user.id, item_id=i, want_category=rng.choice(CATEGORIES),
+                                       emergency=False, active=True, item=item, user=user))
+    index = BarterIndex()
+    index.rebuild(edges)
+    return index
+
+def brute_force_counts(index: BarterIndex, edge_id: int):
+    """2-way and 3-way cycles through one edge, by trying every partner"""
+    edges = index.edges
+
+    def has_what_wants(e, f):
+        return item_matches_want(edges[f].item_category, edges[e].want_category) >= MATCH_THRESHOLD
+
+    e = edges[edge_id]
+    two = sum(
+        1 for f in edges.values()
+        if f.user_id != e.user_id and has_what_wants(edge_id, f.edge_id) and has_what_wants(f.edge_id, edge_id)
+    )
+    three = sum(
+        1 for f in edges.values() for g in edges.values()
+        if len({e.user_id, f.user_id, g.user_id}) == 3 and has_what_wants(edge_id, f.edge_id)
+        and has_what_wants(f.edge_id, g.edge_id) and has_what_wants(g.edge_id, edge_id)
+    )
+    return two, three
+
+def test_counts_match_brute_force():
+    for seed in range(20):
+        index = make_index(n_users=8, n_edges=25, seed=seed)
+        participation = detect_cycle_participation(index)
+        for position, edge_id in enumerate(participation.edge_ids.tolist()):
+            expected = brute_force_counts(index, edge_id)
+            assert (participation.two_way[position], participation.three_way[position]) == expected
+
+def test_stranded_users_have_no_cycle():
+    index = make_index(n_users=30, n_edges=40, seed=7)
+    report = run_cycle_sweep(None, index=index)
+    participation = detect_cycle_participation(index)
+    for user_id in participation.stranded_users():
+        assert all(brute_force_counts(index, edge.edge_id) == (0, 0) for edge in index.user_edges(user_id))
+    assert report["users_in_cycles"] + report["stranded_users"] == report["users"]
+
+if __name__ == "__main__":
+    test_counts_match_brute_force()
+    test_stranded_users_have_no_cycle()
+    print("✅ Sparse cycle counts match brute-force enumeration")
@@ -0,0 +1,118 @@
+import re
+from datetime import datetime
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app import crud, models
+from app.database import Base
+from app.migrations import HOT_PATH_INDEXES, add_hot_path_indexes
+from app.pagination import PageParams
+from app.services.stats_cache import get_stats_cache
+
+# Hot read paths: each must reach its rows through an index, never a table scan
+HOT_QUERIES = {
+    "get_user_items": lambda db: crud.get_user_items(db, 1),
+    "get_active_barter_edges": lambda db: crud.get_active_barter_edges(db),
+    "get_user_barter_edges": lambda db: crud.get_user_barter_edges(db, 1),
+    "get_live_cycle_signatures": lambda db: crud.get_live_cycle_signatures(db),
+    "get_pending_match_item_ids": lambda db: crud.get_pending_match_item_ids(db),
+    "get_user_matches": lambda db: crud.get_user_matches(db, 1),
+    "get_pending_matches_for_item": lambda db: crud.get_pending_matches_for_item(db, 1),
+    "get_lost_found_items": lambda db: crud.get_lost_found_items(db, "lost"),
+    "get_lost_found_by_category": lambda db: crud.get_lost_found_by_category(db, "books"),
+    "get_eco_credit_history": lambda db: crud.get_eco_credit_history(db, 1),
+    "get_user_stats": lambda db: crud.get_user_stats(db, 1),
+    "get_all_users_by_email": lambda db: crud.get_all_users(db, email="USER1@campus.edu"),
+}
+
+# Later pages of keyset-paginated lists: the index must seek to the cursor and
+# already be in page order
+CURSOR = PageParams(limit=5, after=(datetime(2100, 1, 1), 1))
+KEYSET_QUERIES = {
+    "get_all_users": lambda db: crud.get_all_users(db, CURSOR),
+    "get_user_items": lambda db: crud.get_user_items(db, 1, CURSOR),
+    "get_user_barter_edges": lambda db: crud.get_user_barter_edges(db, 1, CURSOR),
+    "get_lost_found_items": lambda db: crud.get_lost_found_items(db, None, CURSOR),
+    "get_lost_found_items_by_type": lambda db: crud.get_lost_found_items(db, "lost", CURSOR),
+    "get_lost_found_by_category": lambda db: crud.get_lost_found_by_category(db, "books", CURSOR),
+    "get_user_eco_credits": lambda db: crud.get_user_eco_credits(db, 1, CURSOR),
+}
+
+# "SCAN <table>" without an index is a full table scan
+TABLE_SCAN = re.compile(r"^SCAN (\w+)$")
+
+def make_session():
+    """In-memory database with the full schema and a few rows in every hot table"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    for i in range(1, 21):
+        db.add(models.User(id=i, name=f"User {i}", email=f"user{i}@campus.edu", semester=1 + i % 8,
+                           department="Mechanical", hostel="Block A"))
+        db.add(models.Item(id=i, owner_id=i, name=f"Item {i}", category="books", condition="good"))
+        db.add(models.BarterEdge(id=i, user_id=i, item_id=i, want_category="books", active=i % 3 != 0))
+        db.add(models.LostFound(user_id=i, item_name=f"Lost {i}", category="books", type="lost" if i % 2 else "found"))
+        db.add(models.EcoCredit(user_id=i, amount=10, reason="Completed direct swap"))
+        db.add(models.EcoCreditTotal(user_id=i, total=10))
+    for i in range(1, 20, 2):
+        db.add(models.Match(id=i, user_id=i, type="direct", participants="[]", status="pending", members=[
+            models.MatchParticipant(position=0, user_id=i, item_id=i, wants="books"),
+            models.MatchParticipant(position=1, user_id=i + 1, item_id=i + 1, wants="books"),
+        ]))
+    db.commit()
+    return db
+
+def query_plans(db, run):
+    """EXPLAIN QUERY PLAN detail lines for every SELECT that run(db) issues"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        run(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    with engine.connect() as conn:
+        return [
+            (statement, [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)])
+            for statement, parameters in statements
+        ]
+
+def test_hot_queries_use_indexes():
+    db = make_session()
+    get_stats_cache().clear()
+    for name, run in HOT_QUERIES.items():
+        plans = query_plans(db, run)
+        assert plans, f"{name} issued no queries"
+        for statement, plan in plans:
+            scans = [line for line in plan if TABLE_SCAN.match(line)]
+            assert not scans, f"{name} scans {scans}:\n{statement}\n{plan}"
+
+def test_keyset_pages_seek_the_index():
+    db = make_session()
+    for name, run in KEYSET_QUERIES.items():
+        [(statement, plan)] = query_plans(db, run)
+        assert plan[0].startswith("SEARCH") and "created_at<?" in plan[0], f"{name} does not seek:\n{plan}"
+        assert not any("TEMP B-TREE" in line for line in plan), f"{name} sorts:\n{plan}"
+
+def test_migration_adds_missing_indexes():
+    db = make_session()
+    conn = db.connection()
+    for index_names in HOT_PATH_INDEXES.values():
+        for index_name in index_names:
+            conn.execute(text(f"DROP INDEX {index_name}"))
+    add_hot_path_indexes(conn)
+    for table_name, index_names in HOT_PATH_INDEXES.items():
+        existing = {index["name"] for index in inspect(conn).get_indexes(table_name)}
+        assert set(index_names) <= existing
+
+if __name__ == "__main__":
+    test_hot_queries_use_indexes()
+    test_keyset_pages_seek_the_index()
+    test_migration_adds_missing_indexes()
+    print("✅ Every hot query is served by an index")
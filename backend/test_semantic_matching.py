@@ -0,0 +1,38 @@
+from app.services.semantic_index import semantic_similarity
+from app.services.similarity import MATCH_THRESHOLD
+
+# Synonyms from the campus lexicon: each satisfies a want for the other
+MATCHES = [
+    ("notes", "study material"),
+    ("textbook", "books"),
+    ("bike", "bicycle"),
+    ("calculator", "scientific calculator"),
+    ("lab coat", "apron"),
+    ("earphones", "earbuds"),
+    ("power bank", "portable charger"),
+]
+
+# Related but different things: sharing a family must not make them a match
+NON_MATCHES = [
+    ("laptop", "mouse"),
+    ("laptop", "charger"),
+    ("guitar", "flute"),
+    ("chair", "mattress"),
+    ("notes", "textbook"),
+    ("drafter", "calculator"),
+    ("lab coat", "goggles"),
+    ("electronics", "laptop"),
+]
+
+def test_synonyms_match():
+    for a, b in MATCHES:
+        assert semantic_similarity(a, b) >= MATCH_THRESHOLD, (a, b, semantic_similarity(a, b))
+
+def test_related_items_do_not_match():
+    for a, b in NON_MATCHES:
+        assert semantic_similarity(a, b) < MATCH_THRESHOLD, (a, b, semantic_similarity(a, b))
+
+if __name__ == "__main__":
+    test_synonyms_match()
+    test_related_items_do_not_match()
+    print("✅ Semantic matcher pairs synonyms and keeps related items apart")
@@ -26,7 +26,7 @@ def test_registration():
         
         # 3. Verify Persistence (Login simulation)
         print("Verifying persistence via Lookup...")
-        all_users = requests.get(f"{BASE_URL}/users/").json()
+        all_users = requests.get(f"{BASE_URL}/users/", params={"email": new_user['email']}).json()["items"]
         found = next((x for x in all_users if x['email'] == new_user['email']), None)
         
         if found:
@@ -37,7 +37,7 @@ def test_registration():
     elif res.status_code == 400 and "already registered" in res.text:
         print("⚠️ Candidate already exists (Test is idempotent).")
         # Verify anyway
-        all_users = requests.get(f"{BASE_URL}/users/").json()
+        all_users = requests.get(f"{BASE_URL}/users/", params={"email": new_user['email']}).json()["items"]
         found = next((x for x in all_users if x['email'] == new_user['email']), None)
         if found: print(f"✅ Verified existing candidate. ID: {found['id']}")
         
@@ -39,7 +39,7 @@ const API_BASE = (window.location.hostname === 'localhost' || window.location.ho
 async function loadLostFoundItems() {
     try {
         const response = await fetch(`${API_BASE}/lost-found/`);
-        const items = await response.json();
+        const { items } = await response.json();
         const container = document.getElementById('lostFoundList');
 
         const baseUrl = API_BASE.replace('/api/v1', ''); // http://loc:8000 or https://site
@@ -143,9 +143,9 @@ document.addEventListener('DOMContentLoaded', () => {
 
 async function populateUserSelects() {
     try {
-        let response = await fetch(`${API_BASE}/users/`);
+        let response = await fetch(`${API_BASE}/users/?limit=200`);
         if (!response.ok) throw new Error('Failed to fetch users');
-        let users = await response.json();
+        let users = (await response.json()).items;
 
         // AUTO-SEED if empty (for Vercel Demo)
         if (users.length === 0) {
@@ -161,8 +161,8 @@ async function populateUserSelects() {
             ));
 
             // Re-fetch
-            response = await fetch(`${API_BASE}/users/`);
-            users = await response.json();
+            response = await fetch(`${API_BASE}/users/?limit=200`);
+            users = (await response.json()).items;
         }
 
         const selects = ['userSelectUpload', 'userSelectBarter', 'userSelectMatches', 'lostFoundUserId'];
@@ -191,12 +191,10 @@ document.getElementById('loginForm')?.addEventListener('submit', async (e) => {
     respDiv.innerHTML = "";
 
     try {
-        // Fetch all users to find match (Mock Auth)
-        const res = await fetch(`${API_BASE}/users/`);
+        // Look the user up by email (Mock Auth)
+        const res = await fetch(`${API_BASE}/users/?email=${encodeURIComponent(email)}`);
         if (!res.ok) throw new Error('API Error');
-        const users = await res.json();
-
-        const found = users.find(u => u.email.toLowerCase() === email.toLowerCase());
+        const found = (await res.json()).items[0];
 
         if (found) {
             triggerConfetti();
@@ -267,8 +265,8 @@ async function loginDemoUser() {
 
         // If 400, it exists. Fetch all users to find ID.
         if (res.status === 400) {
-            const all = await (await fetch(`${API_BASE}/users/`)).json();
-            const found = all.find(u => u.email === demoUser.email);
+            const res2 = await fetch(`${API_BASE}/users/?email=${encodeURIComponent(demoUser.email)}`);
+            const found = (await res2.json()).items[0];
             if (found) {
                 triggerConfetti();
                 updateAuthState(found);
@@ -370,16 +368,34 @@ document.getElementById('barterIntentForm')?.addEventListener('submit', async (e
         const result = await response.json();
         const div = document.getElementById('barterResponse');
         if (response.ok) {
-            div.innerHTML = result.match_found ?
-                `<div style="background:#d1fae5; padding:16px; border-radius:8px; color:#065f46; border:1px solid #10b981;"><strong>🎉 MATCH FOUND!</strong><br>View Details in 'Matches' tab.</div>` :
-                `<div style="background:#eff6ff; padding:16px; border-radius:8px; color:#1e40af; border:1px solid #3b82f6;">✅ Intent Posted. We'll search for matches.</div>`;
-            if (result.match_found) triggerConfetti();
+            div.innerHTML = `<div style="background:#eff6ff; padding:16px; border-radius:8px; color:#1e40af; border:1px solid #3b82f6;">✅ Intent Posted. We'll search for matches.</div>`;
+            if (!showMatchingJob(result.job, div)) pollMatchingJob(result.job_id, div);
             e.target.reset();
             document.getElementById('userSelectBarter').value = CURRENT_USER ? CURRENT_USER.id : "";
         } else div.innerHTML = `<div style="color: var(--error);">❌ Error: ${result.detail}</div>`;
     } catch (err) { console.error(err); }
 });
 
+// Show a finished matching job; returns false while it is still queued or running
+function showMatchingJob(job, div) {
+    if (!job || job.status === 'queued' || job.status === 'running') return false;
+    if (job.match_found) {
+        div.innerHTML = `<div style="background:#d1fae5; padding:16px; border-radius:8px; color:#065f46; border:1px solid #10b981;"><strong>🎉 MATCH FOUND!</strong><br>View Details in 'Matches' tab.</div>`;
+        triggerConfetti();
+    }
+    return true;
+}
+
+// Poll a queued matching job until it finishes (matching runs in the background)
+async function pollMatchingJob(jobId, div, attempts = 20) {
+    for (let i = 0; i < attempts; i++) {
+        await new Promise(r => setTimeout(r, 1000));
+        const res = await fetch(`${API_BASE}/barter/matching-jobs/${jobId}`);
+        if (!res.ok) return;
+        if (showMatchingJob(await res.json(), div)) return;
+    }
+}
+
 // LOST & FOUND LOGIC
 document.getElementById('lostFoundForm')?.addEventListener('submit', async (e) => {
     e.preventDefault();
@@ -421,7 +437,7 @@ document.getElementById('lostFoundForm')?.addEventListener('submit', async (e) =
 async function loadLostFoundItems() {
     try {
         const response = await fetch(`${API_BASE}/lost-found/`);
-        const items = await response.json();
+        const { items } = await response.json();
         const container = document.getElementById('lostFoundList');
 
         const baseUrl = API_BASE.replace('/api/v1', ''); // http://loc:8000 or https://site
@@ -444,8 +460,8 @@ async function loadLostFoundItems() {
 document.getElementById('userSelectBarter')?.addEventListener('change', async (e) => {
     const userId = e.target.value;
     if (!userId) return;
-    const res = await fetch(`${API_BASE}/items/users/${userId}/items`);
-    const items = await res.json();
+    const res = await fetch(`${API_BASE}/items/users/${userId}/items?limit=200`);
+    const { items } = await res.json();
     const select = document.getElementById('itemSelectBarter');
     select.innerHTML = '<option value="">Select Asset</option>';
     items.forEach(i => {
@@ -457,10 +473,10 @@ document.getElementById('userSelectBarter')?.addEventListener('change', async (e
 async function loadMatches() {
     const userId = document.getElementById('userSelectMatches').value;
     const res = await fetch(`${API_BASE}/matches/${userId}`);
-    const matches = await res.json();
+    const matches = (await res.json()).items;
     document.getElementById('matchesList').innerHTML = matches.map(m => `
         <div class="glass-panel" style="margin-bottom:16px;">
-            <div style="font-weight:700; color:#1f2937;">${m.type === 'three_way' ? 'Statement Cycle' : 'Direct Swap'}</div>
+            <div style="font-weight:700; color:#1f2937;">${m.type === 'multi_way' ? `${m.participants.length}-Party Cycle` : m.type === 'three_way' ? 'Statement Cycle' : 'Direct Swap'}</div>
             <div>${m.participants.map(p => `<div>${p.user_name} ➔ ${p.wants}</div>`).join('')}</div>
             ${m.status === 'pending' ? `<button class="btn-primary" onclick="acceptMatch(${m.id}, ${userId})">Authorize</button>` : ''}
         </div>